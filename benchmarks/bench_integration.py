@@ -0,0 +1,265 @@
+"""Offline benchmarks against the local FixtureServer.
+
+Each benchmark records its metrics with the ``report`` fixture; see
+conftest.py for how to run them. Benchmarks that measure a guarantee of
+the integration, rather than a cost, also assert it.
+"""
+import asyncio
+from datetime import timedelta
+import json
+import re
+import time
+import tracemalloc
+
+import pytest
+
+from homeassistant import config_entries
+from homeassistant.data_entry_flow import FlowResultType
+from homeassistant.helpers import entity_registry as er
+from homeassistant.setup import async_setup_component
+from homeassistant.util.json import json_loads
+from pytest_homeassistant_custom_component.common import MockConfigEntry, async_fire_time_changed
+
+from custom_components.dineoncampus.const import DEFAULT_WINDOWS, DOMAIN
+from custom_components.dineoncampus.models import parse_menu
+
+from .server import load_fixture, scale_menu
+
+SCHOOL = load_fixture("sites_public.json")["sites"][0]
+PERIODS = load_fixture("periods.json")["periods"]
+
+# Midnight local time (the test instance runs on US/Pacific), so a
+# simulated day covers every meal window once.
+MIDNIGHT = "2026-03-02T00:00:00-08:00"
+NOON = "2026-03-02T12:00:00-08:00"
+
+# Ten entries retrying every STALE_RETRY_INTERVAL would make about 120
+# requests an hour; the circuit breaker should keep an outage far below that.
+OUTAGE_REQUESTS_PER_HOUR = 20
+
+
+def _slug(text):
+    return re.sub(r"[^a-zA-Z0-9]+", "_", text).lower().strip("_")
+
+
+def _dynamic_entry(location):
+    windows = {
+        p["slug"]: {"id": p["id"], "name": p["name"], "start": DEFAULT_WINDOWS[p["slug"]][0], "end": DEFAULT_WINDOWS[p["slug"]][1]}
+        for p in PERIODS
+    }
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"{SCHOOL['name']} - {location['name']} (Dynamic)",
+        unique_id=f"{SCHOOL['id']}_{location['id']}_dynamic",
+        data={
+            "school_id": SCHOOL["id"],
+            "location_id": location["id"],
+            "location_name": location["name"],
+            "dynamic": True,
+            "period_windows": windows,
+        },
+    )
+
+
+def _static_entry(location, period_name="Lunch"):
+    period = next(p for p in PERIODS if p["name"] == period_name)
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"{SCHOOL['name']} - {location['name']} - {period_name}",
+        unique_id=f"{SCHOOL['id']}_{location['id']}_{period['id']}",
+        data={
+            "school_id": SCHOOL["id"],
+            "location_id": location["id"],
+            "location_name": location["name"],
+            "period_id": period["id"],
+            "period_name": period_name,
+            "dynamic": False,
+        },
+    )
+
+
+async def _setup(hass, entries):
+    for entry in entries:
+        entry.add_to_hass(hass)
+    assert await async_setup_component(hass, DOMAIN, {})
+    await hass.async_block_till_done()
+
+
+async def _advance(hass, freezer, duration, step=timedelta(minutes=1)):
+    """Run ``duration`` of simulated time, firing due timers every ``step``."""
+    for _ in range(int(duration / step)):
+        freezer.tick(step)
+        async_fire_time_changed(hass)
+        await hass.async_block_till_done()
+
+
+def _percentile(values, fraction):
+    values = sorted(values)
+    return values[min(len(values) - 1, int(len(values) * fraction))]
+
+
+@pytest.mark.parametrize("scale", [1, 10, 50])
+async def test_parse_menu(scale, report):
+    """CPU time and retained memory of decoding and parsing one menu."""
+    body = json.dumps(scale_menu(load_fixture("menu.json"), scale)).encode()
+    rounds = max(5, 200 // scale)
+
+    start = time.process_time()
+    for _ in range(rounds):
+        parse_menu(json_loads(body), "Lunch")
+    cpu = (time.process_time() - start) / rounds
+
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    menu = parse_menu(json_loads(body), "Lunch")
+    retained = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+
+    report(body_kib=round(len(body) / 1024, 1), items=menu.total, parse_ms=round(cpu * 1000, 3), retained_kib=round(retained / 1024, 1))
+
+
+@pytest.mark.parametrize("entries", [1, 10, 50])
+async def test_requests_per_hour(hass, unthrottled, freezer, entries, report):
+    """API requests over a simulated day for ``entries`` dynamic entries."""
+    freezer.move_to(MIDNIGHT)
+    tracemalloc.start()
+    await _setup(hass, [_dynamic_entry(location) for location in unthrottled.locations[:entries]])
+    setup_memory = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    setup_requests = unthrottled.total
+
+    unthrottled.reset()
+    await _advance(hass, freezer, timedelta(hours=24))
+
+    report(
+        entries=entries,
+        setup_requests=setup_requests,
+        requests_per_hour=round(unthrottled.total / 24, 1),
+        kib_per_hour=round(unthrottled.bytes_sent / 24 / 1024, 1),
+        setup_kib=round(setup_memory / 1024),
+    )
+
+
+@pytest.mark.parametrize("delay", [0.0, 0.25])
+@pytest.mark.parametrize("entries", [1, 10])
+async def test_refresh_latency(hass, api_server, entries, delay, report):
+    """Wall time of a manual refresh per location, through the real rate limiter."""
+    await _setup(hass, [_static_entry(location) for location in api_server.locations[:entries]])
+    api_server.delay = delay
+    api_server.reset()
+
+    latencies = []
+    for _ in range(3):
+        for coordinator in list(hass.data[DOMAIN]["coordinators"].values()):
+            start = time.perf_counter()
+            await coordinator.async_refresh_now()
+            latencies.append(time.perf_counter() - start)
+
+    report(
+        entries=entries,
+        server_delay_ms=int(delay * 1000),
+        p50_ms=round(_percentile(latencies, 0.5) * 1000, 1),
+        p95_ms=round(_percentile(latencies, 0.95) * 1000, 1),
+        max_ms=round(max(latencies) * 1000, 1),
+        requests_per_refresh=round(api_server.total / len(latencies), 2),
+    )
+
+
+async def test_coalesced_refresh(hass, api_server, report):
+    """Concurrent manual refreshes of one location share a single fetch."""
+    location = api_server.locations[0]
+    await _setup(hass, [_static_entry(location, name) for name in ("Breakfast", "Lunch", "Dinner")])
+    coordinator = hass.data[DOMAIN]["coordinators"][location["id"]]
+    api_server.delay = 0.1
+    api_server.reset()
+    await coordinator.async_refresh_now()
+    single = api_server.total
+
+    api_server.reset()
+    await asyncio.gather(*(coordinator.async_refresh_now() for _ in range(10)))
+
+    report(presses=10, requests=api_server.total, requests_per_refresh=single)
+    assert single > 0
+    assert api_server.total == single
+
+
+@pytest.mark.parametrize("scale", [1, 20])
+async def test_category_fanout(hass, api_server, scale, report):
+    """Time to push one coordinator update to a menu sensor and its category sensors."""
+    api_server.menu_scale = scale
+    entry = _static_entry(api_server.locations[0])
+    await _setup(hass, [entry])
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]
+    categories = [
+        e for e in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)
+        if e.domain == "sensor" and e.entity_category is None and not e.unique_id.endswith(entry.data["period_id"])
+    ]
+
+    start = time.perf_counter()
+    for _ in range(10):
+        coordinator.async_update_listeners()
+        await hass.async_block_till_done()
+    fanout = (time.perf_counter() - start) / 10
+
+    report(category_sensors=len(categories), fanout_ms=round(fanout * 1000, 2))
+
+
+async def test_stale_while_failing(hass, unthrottled, freezer, report):
+    """Requests made, and menus kept, while every response is an error."""
+    freezer.move_to(NOON)
+    locations = unthrottled.locations[:10]
+    await _setup(hass, [_dynamic_entry(location) for location in locations])
+
+    unthrottled.fail_every = 1
+    unthrottled.reset()
+    await _advance(hass, freezer, timedelta(hours=2))
+
+    states = [hass.states.get(f"sensor.{_slug(location['name'])}_current_menu") for location in locations]
+    showing = sum(1 for state in states if state and state.state not in ("0", "unknown", "unavailable"))
+    stale = sum(1 for state in states if state and state.attributes.get("stale_since"))
+    requests_per_hour = unthrottled.total / 2
+    report(
+        entries=len(locations),
+        requests_per_hour=round(requests_per_hour, 1),
+        still_showing_menu=showing,
+        marked_stale=stale,
+    )
+    assert requests_per_hour <= OUTAGE_REQUESTS_PER_HOUR
+    assert showing == len(locations)
+    assert stale == len(locations)
+
+
+async def test_config_flow(hass, api_server, report):
+    """Duration and requests of the user flow, with a cold and then a warm catalog."""
+    windows = {
+        f"{p['slug']}_{edge}": DEFAULT_WINDOWS[p["slug"]][n]
+        for p in PERIODS
+        for n, edge in enumerate(("start", "end"))
+    }
+
+    async def _run_flow(location_name):
+        before = api_server.total
+        start = time.perf_counter()
+        result = await hass.config_entries.flow.async_init(DOMAIN, context={"source": config_entries.SOURCE_USER})
+        for user_input in (
+            {"search": "example state"},
+            {"school": SCHOOL["name"]},
+            {"scope": "location"},
+            {"location": location_name},
+            {"mode": "dynamic"},
+            windows,
+        ):
+            result = await hass.config_entries.flow.async_configure(result["flow_id"], user_input)
+        assert result["type"] is FlowResultType.CREATE_ENTRY
+        await hass.async_block_till_done()
+        return time.perf_counter() - start, api_server.total - before
+
+    cold_time, cold_requests = await _run_flow(api_server.locations[0]["name"])
+    warm_time, warm_requests = await _run_flow(api_server.locations[1]["name"])
+
+    report(
+        cold_ms=round(cold_time * 1000, 1),
+        cold_requests=cold_requests,
+        warm_ms=round(warm_time * 1000, 1),
+        warm_requests=warm_requests,
+    )
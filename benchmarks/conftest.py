@@ -0,0 +1,89 @@
+"""Fixtures for the offline benchmarks.
+
+Run from the repository root with::
+
+    pip install -r benchmarks/requirements.txt
+    pytest benchmarks
+
+Results are printed after the run and written to ``bench_output.txt``.
+The benchmarks need Home Assistant and import it at module level. Only
+``bench_*.py`` files are collected, and only by the ``pytest.ini`` in this
+directory, so a ``pytest`` run of the unit tests never imports them.
+"""
+import math
+from pathlib import Path
+
+import pytest
+
+OUTPUT = Path(__file__).parent.parent / "bench_output.txt"
+RESULTS = []
+
+
+def pytest_terminal_summary(terminalreporter):
+    if not RESULTS:
+        return
+    lines = [f"{name}: " + ", ".join(f"{key}={value}" for key, value in metrics.items()) for name, metrics in RESULTS]
+    terminalreporter.section("DineOnCampus benchmarks")
+    for line in lines:
+        terminalreporter.write_line(line)
+    OUTPUT.write_text("\n".join(lines) + "\n")
+
+
+@pytest.fixture
+def report(request):
+    """Record a benchmark's metrics under the running test's id."""
+
+    def _report(**metrics):
+        RESULTS.append((request.node.name, metrics))
+
+    return _report
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+def expected_lingering_timers():
+    """Entries stay loaded when a benchmark ends, with their refreshes scheduled."""
+    return True
+
+
+@pytest.fixture
+async def api_server(hass, socket_enabled):
+    """Start a FixtureServer and point the integration's API client at it.
+
+    The test harness blocks sockets; the server only listens on 127.0.0.1.
+    """
+    from aiohttp.test_utils import TestServer
+    from homeassistant.helpers.aiohttp_client import async_get_clientsession
+
+    from custom_components.dineoncampus.api import DineOnCampusApi
+    from custom_components.dineoncampus.const import DOMAIN
+
+    from .server import FixtureServer
+
+    server = FixtureServer(locations=64)
+    test_server = TestServer(server.app, host="127.0.0.1")
+    await test_server.start_server()
+    server.base_url = str(test_server.make_url("/")).rstrip("/")
+    server.api = hass.data.setdefault(DOMAIN, {})["api"] = DineOnCampusApi(
+        async_get_clientsession(hass), server.base_url
+    )
+    yield server
+    await test_server.close()
+
+
+@pytest.fixture
+def unthrottled(monkeypatch, api_server):
+    """Lift the token bucket for simulations that run on frozen time.
+
+    The bucket refills from ``time.monotonic``, which does not advance
+    between simulated ticks. Circuit breakers still apply.
+    """
+    from custom_components.dineoncampus import governor
+
+    monkeypatch.setattr(governor, "TOKEN_BUCKET_BURST", math.inf)
+    api_server.api.governor = governor.RequestGovernor()
+    return api_server
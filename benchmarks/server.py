@@ -0,0 +1,96 @@
+"""Local stand-in for the DineOnCampus API, replaying the recorded fixtures."""
+import asyncio
+from collections import Counter
+import copy
+import json
+from pathlib import Path
+
+from aiohttp import web
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    return json.loads((FIXTURES / name).read_text())
+
+
+def scale_menu(menu, scale):
+    """Return the menu fixture with its categories repeated ``scale`` times."""
+    menu = copy.deepcopy(menu)
+    categories = menu["period"]["categories"]
+    menu["period"]["categories"] = [
+        {**category, "name": category["name"] if n == 0 else f"{category['name']} {n + 1}"}
+        for n in range(scale)
+        for category in categories
+    ]
+    return menu
+
+
+class FixtureServer:
+    """Serves ``sites/public``, ``status_by_site``, periods and menus.
+
+    ``locations`` extends the recorded location list with synthetic ones, so
+    any number of entries can point at distinct locations. Every location
+    serves the same periods and menu. ``menu_scale`` repeats the menu's
+    categories, ``delay`` slows every response and ``fail_every`` answers
+    every n-th request with HTTP 503. All three can be changed while the
+    server runs.
+    """
+
+    def __init__(self, locations=4, menu_scale=1, delay=0.0, fail_every=0):
+        self.delay = delay
+        self.fail_every = fail_every
+        self.requests = Counter()
+        self.bytes_sent = 0
+        self.base_url = None
+
+        self._sites = json.dumps(load_fixture("sites_public.json")).encode()
+        self._periods = json.dumps(load_fixture("periods.json")).encode()
+        self._menu = load_fixture("menu.json")
+        status = load_fixture("status_by_site.json")
+        recorded = status["locations"]
+        for n in range(len(recorded), locations):
+            recorded.append({"id": f"bench{n:04d}", "name": f"Bench Location {n}", "status": {"label": "open"}})
+        self.locations = recorded[:locations]
+        self._status = json.dumps({**status, "locations": self.locations}).encode()
+        self.menu_scale = menu_scale
+
+        self.app = web.Application()
+        self.app.router.add_get("/sites/public", self._handler("sites", lambda request: self._sites))
+        self.app.router.add_get("/locations/status_by_site", self._handler("status", lambda request: self._status))
+        self.app.router.add_get("/locations/{location}/periods/", self._handler("periods", lambda request: self._periods))
+        self.app.router.add_get("/locations/{location}/menu", self._handler("menu", lambda request: self._menu_body))
+
+    @property
+    def menu_scale(self):
+        return self._menu_scale
+
+    @menu_scale.setter
+    def menu_scale(self, scale):
+        self._menu_scale = scale
+        self._menu_body = json.dumps(scale_menu(self._menu, scale)).encode()
+
+    @property
+    def menu_body(self):
+        return self._menu_body
+
+    @property
+    def total(self):
+        return sum(self.requests.values())
+
+    def reset(self):
+        self.requests.clear()
+        self.bytes_sent = 0
+
+    def _handler(self, route, body):
+        async def _handle(request):
+            self.requests[route] += 1
+            if self.delay:
+                await asyncio.sleep(self.delay)
+            if self.fail_every and self.total % self.fail_every == 0:
+                return web.Response(status=503, text="Service Unavailable")
+            payload = body(request)
+            self.bytes_sent += len(payload)
+            return web.Response(body=payload, content_type="application/json")
+
+        return _handle
@@ -1,14 +1,61 @@
 from homeassistant.config_entries import ConfigEntry
 from homeassistant.core import HomeAssistant
+import homeassistant.helpers.config_validation as cv
 
-DOMAIN = "dineoncampus"
+from .const import DOMAIN, PLATFORMS, SITE_PLATFORMS
+from .coordinator import async_get_coordinator, async_release_coordinator
+from .services import async_setup_services
+from .site import DineOnCampusSiteCoordinator
+from .snapshot import async_get_snapshot
+
+CONFIG_SCHEMA = cv.config_entry_only_config_schema(DOMAIN)
+
+async def async_setup(hass: HomeAssistant, config):
+    """Set up the DineOnCampus services."""
+    async_setup_services(hass)
+    return True
 
 async def async_setup_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Set up DineOnCampus from a config entry."""
-    await hass.config_entries.async_forward_entry_setups(entry, ["sensor", "button"])
+    if entry.data.get("site"):
+        return await _async_setup_site_entry(hass, entry)
+
+    snapshot = await async_get_snapshot(hass)
+    coordinator = async_get_coordinator(hass, entry, snapshot)
+    hass.data[DOMAIN].setdefault("entries", {})[entry.entry_id] = coordinator
+    await hass.config_entries.async_forward_entry_setups(entry, PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    if entry.options.get("prefetch"):
+        entry.async_create_background_task(
+            hass,
+            coordinator.async_prefetch(entry.options.get("prefetch_days", 0)),
+            f"{DOMAIN} prefetch {entry.entry_id}",
+        )
     return True
 
+async def _async_setup_site_entry(hass: HomeAssistant, entry: ConfigEntry):
+    """Set up a whole-site entry covering every location at a school."""
+    coordinator = DineOnCampusSiteCoordinator(hass, entry)
+    await coordinator.async_config_entry_first_refresh()
+    hass.data.setdefault(DOMAIN, {}).setdefault("sites", {})[entry.entry_id] = coordinator
+    await hass.config_entries.async_forward_entry_setups(entry, SITE_PLATFORMS)
+    entry.async_on_unload(entry.add_update_listener(_async_update_listener))
+    return True
+
+async def _async_update_listener(hass: HomeAssistant, entry: ConfigEntry):
+    """Reload the entry when its options change."""
+    await hass.config_entries.async_reload(entry.entry_id)
+
 async def async_unload_entry(hass: HomeAssistant, entry: ConfigEntry):
     """Unload a config entry."""
-    unload_ok = await hass.config_entries.async_unload_platforms(entry, ["sensor", "button"])
+    if entry.data.get("site"):
+        unload_ok = await hass.config_entries.async_unload_platforms(entry, SITE_PLATFORMS)
+        if unload_ok:
+            await hass.data[DOMAIN]["sites"].pop(entry.entry_id).async_shutdown()
+        return unload_ok
+
+    unload_ok = await hass.config_entries.async_unload_platforms(entry, PLATFORMS)
+    if unload_ok:
+        hass.data[DOMAIN]["entries"].pop(entry.entry_id, None)
+        await async_release_coordinator(hass, entry)
     return unload_ok
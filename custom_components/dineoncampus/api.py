@@ -0,0 +1,132 @@
+import asyncio
+import logging
+import time
+from urllib.parse import urlsplit
+
+import aiohttp
+from homeassistant.core import callback
+from homeassistant.helpers.aiohttp_client import async_get_clientsession
+from homeassistant.util.json import json_loads
+
+from .cache import PeriodsCache
+from .const import (
+    API_BASE_URL,
+    DOMAIN,
+    LOCATIONS_PATH,
+    MAX_CONCURRENT_REQUESTS,
+    MENU_PATH,
+    PERIODS_PATH,
+    REQUEST_TIMEOUT,
+    SCHOOLS_PATH,
+)
+from .governor import RequestGovernor, parse_retry_after
+from .models import LazyTruncated
+from .stats import RequestStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_api(hass):
+    """Return the integration-wide API client, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    api = data.get("api")
+    if api is None:
+        api = data["api"] = DineOnCampusApi(async_get_clientsession(hass))
+    return api
+
+
+class DineOnCampusApiError(Exception):
+    """The DineOnCampus API could not be reached or returned unusable data."""
+
+
+class DineOnCampusApi:
+    """Client for apiv4.dineoncampus.com, or another server at ``base_url``.
+
+    Requests go through Home Assistant's shared aiohttp session, so
+    connections are pooled and kept alive between polls. Every request has a
+    timeout and at most ``MAX_CONCURRENT_REQUESTS`` are in flight at once.
+    Every request is also admitted by the shared RequestGovernor, which
+    rate-limits requests and stops them while the API is failing. Outcomes
+    are counted in ``stats`` for diagnostics, or in the RequestStats passed
+    as ``stats=``, which rolls up into them.
+    """
+
+    def __init__(self, session, base_url=API_BASE_URL):
+        self._session = session
+        self._base_url = base_url.rstrip("/")
+        self._timeout = aiohttp.ClientTimeout(total=REQUEST_TIMEOUT.total_seconds())
+        self._semaphore = asyncio.Semaphore(MAX_CONCURRENT_REQUESTS)
+        self.periods = PeriodsCache()
+        self.governor = RequestGovernor()
+        self.stats = RequestStats()
+
+    async def async_get_json(self, url: str, kind="other", stats=None):
+        stats = stats or self.stats
+        host = urlsplit(url).hostname
+        if not await self.governor.async_acquire(host):
+            stats.record_rejected()
+            raise DineOnCampusApiError(
+                f"Skipped {url}: API paused for {self.governor.retry_in(host):.0f}s after repeated failures"
+            )
+        try:
+            async with self._semaphore:
+                started = time.monotonic()
+                async with self._session.get(url, timeout=self._timeout) as resp:
+                    body = await resp.read()
+                    status = resp.status
+                    retry_after = parse_retry_after(resp.headers.get("Retry-After"))
+        except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+            self.governor.record_failure(host)
+            stats.record_error("timeout" if isinstance(e, asyncio.TimeoutError) else "connection")
+            raise DineOnCampusApiError(f"Request to {url} failed: {e!r}") from e
+        except BaseException:
+            # Cancelled while queued or in flight: free the probe slot without an outcome
+            self.governor.release(host)
+            raise
+
+        stats.record_request(kind, time.monotonic() - started, len(body))
+        if status == 429 or status >= 500:
+            self.governor.record_failure(host, retry_after)
+        else:
+            self.governor.record_success(host)
+        if status != 200:
+            stats.record_error(f"http_{status}")
+            raise DineOnCampusApiError(f"API {url} -> HTTP {status}: {LazyTruncated(body)}")
+        _LOGGER.debug("API %s -> HTTP %s (%s bytes): %s", url, status, len(body), LazyTruncated(body))
+        try:
+            # Decode the raw bytes once, with orjson
+            data = json_loads(body)
+        except ValueError as e:
+            stats.record_error("json")
+            raise DineOnCampusApiError(f"JSON parse error for {url}: {e}") from e
+        stats.record_success()
+        return data
+
+    async def async_get_sites(self):
+        data = await self.async_get_json(self._base_url + SCHOOLS_PATH, "sites")
+        return (data if isinstance(data, list) else data.get("sites", [])) or []
+
+    async def async_get_locations(self, site_id, stats=None):
+        data = await self.async_get_json(self._base_url + LOCATIONS_PATH.format(site_id), "locations", stats)
+        return (data.get("locations", []) if isinstance(data, dict) else data) or []
+
+    async def async_get_periods(self, location_id, date, stats=None):
+        periods = self.periods.get(location_id, date)
+        (stats or self.stats).record_cache("periods", periods is not None)
+        if periods is None:
+            data = await self.async_get_json(self._base_url + PERIODS_PATH.format(location_id, date), "periods", stats)
+            periods = (data.get("periods", []) if isinstance(data, dict) else data) or []
+            self.periods.set(location_id, date, periods)
+        return periods
+
+    async def async_resolve_period_id(self, location_id, date, period_name, stats=None):
+        """Return the id of the named period on a date, or None if it is not served."""
+        for p in await self.async_get_periods(location_id, date, stats):
+            if p.get("name", "").lower() == period_name.lower():
+                return p.get("id")
+        return None
+
+    async def async_get_menu(self, location_id, date, period_id, stats=None):
+        data = await self.async_get_json(self._base_url + MENU_PATH.format(location_id, date, period_id), "menu", stats)
+        return data if isinstance(data, dict) else {}
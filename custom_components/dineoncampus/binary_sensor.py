@@ -0,0 +1,55 @@
+from homeassistant.components.binary_sensor import BinarySensorEntity
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
+import logging
+import re
+
+from .const import DOMAIN
+
+_LOGGER = logging.getLogger(__name__)
+
+async def async_setup_entry(hass, entry, async_add_entities):
+    if not entry.data.get("site"):
+        return
+    coordinator = hass.data[DOMAIN]["sites"][entry.entry_id]
+    known = set()
+
+    @callback
+    def _add_locations():
+        new = [location for location_id, location in coordinator.data.items() if location_id not in known]
+        if new:
+            known.update(location.id for location in new)
+            async_add_entities([DineOnCampusLocationOpenSensor(coordinator, entry, location) for location in new])
+            _LOGGER.debug("Added open/closed sensors for %s", [location.name for location in new])
+
+    _add_locations()
+    entry.async_on_unload(coordinator.async_add_listener(_add_locations))
+
+class DineOnCampusLocationOpenSensor(CoordinatorEntity, BinarySensorEntity):
+    """Whether a location in a whole-site entry is open right now."""
+
+    def __init__(self, coordinator, entry, location):
+        super().__init__(coordinator)
+        self._location_id = location.id
+        self._attr_name = f"{location.name} Open"
+        self._attr_unique_id = f"{entry.data['school_id']}_{location.id}_open"
+        slug = re.sub(r'[^a-zA-Z0-9]+', '_', self._attr_name).lower().strip("_")
+        self.entity_id = f"binary_sensor.{slug}"
+
+    @property
+    def _location(self):
+        return self.coordinator.data.get(self._location_id)
+
+    @property
+    def available(self):
+        return super().available and self._location is not None
+
+    @property
+    def is_on(self):
+        location = self._location
+        return location.is_open if location else None
+
+    @property
+    def extra_state_attributes(self):
+        location = self._location
+        return {"status": location.status} if location else {}
@@ -1,14 +1,12 @@
 import logging
 from homeassistant.components.button import ButtonEntity
-from homeassistant.helpers import entity_registry as er
-from homeassistant.helpers.entity_component import async_update_entity
 
-_LOGGER = logging.getLogger(__name__)
+from .const import DOMAIN
 
-DOMAIN = "dineoncampus"
+_LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
-    async_add_entities([DineOnCampusRefreshButton(hass, entry)], True)
+    async_add_entities([DineOnCampusRefreshButton(hass, entry)])
 
 class DineOnCampusRefreshButton(ButtonEntity):
     """Button to manually refresh the DineOnCampus menu."""
@@ -22,13 +20,6 @@ class DineOnCampusRefreshButton(ButtonEntity):
     async def async_press(self) -> None:
         """Handle the button press."""
         _LOGGER.debug("Force refresh button pressed for %s", self._entry.title)
-
-        entity_reg = er.async_get(self._hass)
-        for entity_id, entry_data in entity_reg.entities.items():
-            if (
-                entry_data.platform == DOMAIN
-                and entry_data.config_entry_id == self._entry.entry_id
-                and entity_id.startswith("sensor.")
-            ):
-                _LOGGER.debug("Triggering async_update for %s", entity_id)
-                await async_update_entity(self._hass, entity_id)
+        data = self._hass.data[DOMAIN]
+        coordinator = data["sites"] if self._entry.data.get("site") else data["entries"]
+        await coordinator[self._entry.entry_id].async_refresh_now()
@@ -0,0 +1,57 @@
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+# An empty periods list usually means the location is closed that day, but
+# menus are sometimes published late, so don't trust it until midnight.
+NEGATIVE_TTL = timedelta(hours=1)
+
+
+def next_local_midnight(now=None):
+    """Return the start of the next local day."""
+    now = now or dt_util.now()
+    return dt_util.start_of_local_day(now) + timedelta(days=1)
+
+
+class PeriodsCache:
+    """Periods served by a location on a date, kept until local midnight.
+
+    Entries are keyed by ``(location_id, date)``. A name missing from a cached
+    list is answered as "not served" without another request; a cached empty
+    list is a negative entry that expires after ``NEGATIVE_TTL``.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, location_id, date):
+        """Return the cached periods list, or None when absent or expired."""
+        entry = self._entries.get((location_id, date))
+        if entry is None:
+            return None
+        expires, periods = entry
+        if dt_util.now() >= expires:
+            del self._entries[(location_id, date)]
+            return None
+        return periods
+
+    def set(self, location_id, date, periods):
+        now = dt_util.now()
+        expires = next_local_midnight(now)
+        if not periods:
+            expires = min(expires, now + NEGATIVE_TTL)
+        self._prune(now)
+        self._entries[(location_id, date)] = (expires, periods)
+
+    def as_dict(self):
+        """Return unexpired entries as ``{location_id: {date: periods}}``."""
+        now = dt_util.now()
+        data = {}
+        for (location_id, date), (expires, periods) in self._entries.items():
+            if now < expires:
+                data.setdefault(location_id, {})[date] = periods
+        return data
+
+    def _prune(self, now):
+        for key in [k for k, (expires, _) in self._entries.items() if now >= expires]:
+            del self._entries[key]
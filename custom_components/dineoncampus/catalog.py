@@ -0,0 +1,126 @@
+import asyncio
+import logging
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import DineOnCampusApiError, async_get_api
+from .const import (
+    CATALOG_LOCATIONS_TTL,
+    CATALOG_MAX_RESULTS,
+    CATALOG_SITES_TTL,
+    DOMAIN,
+    SNAPSHOT_SAVE_DELAY,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 1
+STORAGE_KEY = f"{DOMAIN}.catalog"
+
+
+def async_get_catalog(hass):
+    """Return the integration-wide school and location catalog."""
+    data = hass.data.setdefault(DOMAIN, {})
+    catalog = data.get("catalog")
+    if catalog is None:
+        catalog = data["catalog"] = SchoolCatalog(hass)
+    return catalog
+
+
+class SchoolCatalog:
+    """Schools and their dining locations, cached on disk for the config flow.
+
+    Only ids and names are kept. A stale list is still returned straight
+    away while a background task refreshes it, so the API is only awaited
+    the first time a list is needed. There is at most one fetch per list in
+    flight, and a caller with nothing cached waits for it.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._store = Store(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._data = None
+        self._refreshing = {}
+
+    async def _async_load(self):
+        async with self._lock:
+            if self._data is None:
+                try:
+                    self._data = await self._store.async_load() or {}
+                except Exception as e:
+                    _LOGGER.warning("Ignoring unreadable school catalog: %s", e)
+                    self._data = {}
+                self._data.setdefault("locations", {})
+        return self._data
+
+    async def _async_get(self, container, key, ttl, fetch):
+        data = await self._async_load()
+        cached = data[container].get(key) if container else data.get(key)
+        async_get_api(self._hass).stats.record_cache("catalog", cached is not None)
+        if cached is None:
+            return await asyncio.shield(self._async_start_refresh(container, key, fetch))
+
+        fetched = dt_util.parse_datetime(cached["fetched"])
+        if fetched is None or dt_util.utcnow() - fetched > ttl:
+            self._async_start_refresh(container, key, fetch)
+        return cached["items"]
+
+    def _async_start_refresh(self, container, key, fetch):
+        """Return the in-flight fetch of a list, starting one if there is none."""
+        task = self._refreshing.get((container, key))
+        if task is None:
+            task = self._refreshing[(container, key)] = self._hass.async_create_background_task(
+                self._async_refresh(container, key, fetch),
+                f"{DOMAIN} catalog refresh {key}",
+            )
+            task.add_done_callback(lambda task: self._log_refresh_failure(key, task))
+        return task
+
+    @staticmethod
+    def _log_refresh_failure(key, task):
+        # Retrieve the outcome even when no caller waited for it
+        if not task.cancelled() and task.exception() is not None:
+            _LOGGER.debug("Refresh of the %s catalog failed: %s", key, task.exception())
+
+    async def _async_refresh(self, container, key, fetch):
+        try:
+            items = [{"id": i["id"], "name": i["name"]} for i in await fetch() if i.get("id") and i.get("name")]
+        finally:
+            self._refreshing.pop((container, key), None)
+        entry = {"fetched": dt_util.utcnow().isoformat(), "items": items}
+        if container:
+            self._data[container][key] = entry
+        else:
+            self._data[key] = entry
+        self._store.async_delay_save(lambda: self._data, SNAPSHOT_SAVE_DELAY)
+        return items
+
+    async def async_get_sites(self):
+        return await self._async_get(None, "sites", CATALOG_SITES_TTL, async_get_api(self._hass).async_get_sites)
+
+    async def async_get_locations(self, site_id):
+        api = async_get_api(self._hass)
+        return await self._async_get(
+            "locations", str(site_id), CATALOG_LOCATIONS_TTL, lambda: api.async_get_locations(site_id)
+        )
+
+    async def async_warm(self):
+        """Make sure the school list is loaded, ignoring API errors."""
+        try:
+            await self.async_get_sites()
+        except DineOnCampusApiError as e:
+            _LOGGER.debug("Could not preload the school catalog: %s", e)
+
+    async def async_search_sites(self, query):
+        """Return up to ``CATALOG_MAX_RESULTS`` schools whose names contain every word of ``query``."""
+        words = query.lower().split()
+        matches = {}
+        for site in await self.async_get_sites():
+            name = site["name"]
+            if all(word in name.lower() for word in words):
+                matches[name] = site["id"]
+                if len(matches) >= CATALOG_MAX_RESULTS:
+                    break
+        return dict(sorted(matches.items()))
@@ -1,58 +1,85 @@
-import aiohttp
 import voluptuous as vol
 import homeassistant.helpers.config_validation as cv
-from datetime import date
 from homeassistant import config_entries
+from homeassistant.core import callback
+from homeassistant.util import dt as dt_util
 import logging
 from . import DOMAIN
+from .const import DEFAULT_MAX_STALE_HOURS, MAX_PREFETCH_DAYS, MAX_STALE_HOURS
+from .api import DineOnCampusApiError, async_get_api
+from .catalog import async_get_catalog
+from .schedule import WEEKDAYS, default_window, parse_time
 
 _LOGGER = logging.getLogger(__name__)
 
-SCHOOLS_URL = "https://apiv4.dineoncampus.com/sites/public"
-LOCATIONS_URL = "https://apiv4.dineoncampus.com/locations/status_by_site?siteId={}"
-PERIODS_URL = "https://apiv4.dineoncampus.com/locations/{}/periods/?date={}"
-
-DEFAULT_WINDOWS = {
-    "breakfast": ("05:00", "10:30"),
-    "lunch": ("11:00", "15:00"),
-    "dinner": ("16:00", "23:00"),
-    "everyday": ("00:00", "23:59"),
-}
+DAY_OPTIONS = {day: day.capitalize() for day in WEEKDAYS}
 
 class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
     VERSION = 1
 
+    @staticmethod
+    @callback
+    def async_get_options_flow(config_entry):
+        return DineOnCampusOptionsFlow()
+
     async def async_step_user(self, user_input=None):
         _LOGGER.debug("Step user called with input=%s", user_input)
+        schema = vol.Schema({vol.Required("search"): cv.string})
+        catalog = async_get_catalog(self.hass)
         try:
             if user_input is None:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(SCHOOLS_URL) as resp:
-                        text = await resp.text()
-                        _LOGGER.debug("Schools response [%s]: %s", resp.status, text[:500])
-                        data = await resp.json()
-                        self.schools = {s["name"]: s["id"] for s in (data if isinstance(data, list) else data.get("sites", []))}
-                return self.async_show_form(
-                    step_id="user",
-                    data_schema=vol.Schema({vol.Required("school"): vol.In(list(self.schools.keys()))}),
-                )
-            self.school_name = user_input["school"]
-            self.school_id = self.schools[self.school_name]
-            return await self.async_step_location()
+                # Render at once; the school list loads while the user types
+                self.hass.async_create_background_task(catalog.async_warm(), f"{DOMAIN} catalog preload")
+                return self.async_show_form(step_id="user", data_schema=schema)
+            self.schools = await catalog.async_search_sites(user_input["search"])
+            if not self.schools:
+                return self.async_show_form(step_id="user", data_schema=schema, errors={"base": "no_schools_found"})
+            return await self.async_step_school()
+        except DineOnCampusApiError as e:
+            _LOGGER.error("API error in async_step_user: %s", e)
+            return self.async_show_form(step_id="user", data_schema=schema, errors={"base": "cannot_connect"})
         except Exception as e:
             _LOGGER.exception("Error in async_step_user: %s", e)
-            return self.async_show_form(step_id="user", errors={"base": "unknown"})
+            return self.async_show_form(step_id="user", data_schema=schema, errors={"base": "unknown"})
+
+    async def async_step_school(self, user_input=None):
+        _LOGGER.debug("Step school called with input=%s", user_input)
+        if user_input is None:
+            return self.async_show_form(
+                step_id="school",
+                data_schema=vol.Schema({vol.Required("school"): vol.In(list(self.schools.keys()))}),
+            )
+        self.school_name = user_input["school"]
+        self.school_id = self.schools[self.school_name]
+        return await self.async_step_scope()
+
+    async def async_step_scope(self, user_input=None):
+        _LOGGER.debug("Step scope called with input=%s", user_input)
+        if user_input is None:
+            return self.async_show_form(
+                step_id="scope",
+                data_schema=vol.Schema({vol.Required("scope", default="location"): vol.In(["location", "site"])}),
+            )
+        if user_input["scope"] == "location":
+            return await self.async_step_location()
+
+        await self.async_set_unique_id(f"{self.school_id}_site")
+        self._abort_if_unique_id_configured()
+        return self.async_create_entry(
+            title=f"{self.school_name} (All Locations)",
+            data={
+                "school_id": self.school_id,
+                "school_name": self.school_name,
+                "site": True,
+            }
+        )
 
     async def async_step_location(self, user_input=None):
         _LOGGER.debug("Step location called with input=%s", user_input)
         try:
             if user_input is None:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(LOCATIONS_URL.format(self.school_id)) as resp:
-                        text = await resp.text()
-                        _LOGGER.debug("Locations response [%s]: %s", resp.status, text[:500])
-                        data = await resp.json()
-                        self.locations = {l["name"]: l["id"] for l in (data.get("locations", []) if isinstance(data, dict) else data)}
+                locations = await async_get_catalog(self.hass).async_get_locations(self.school_id)
+                self.locations = {l["name"]: l["id"] for l in locations}
                 return self.async_show_form(
                     step_id="location",
                     data_schema=vol.Schema({vol.Required("location"): vol.In(list(self.locations.keys()))}),
@@ -60,6 +87,9 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
             self.location_name = user_input["location"]
             self.location_id = self.locations[self.location_name]
             return await self.async_step_dynamic_or_static()
+        except DineOnCampusApiError as e:
+            _LOGGER.error("API error in async_step_location: %s", e)
+            return self.async_show_form(step_id="location", errors={"base": "cannot_connect"})
         except Exception as e:
             _LOGGER.exception("Error in async_step_location: %s", e)
             return self.async_show_form(step_id="location", errors={"base": "unknown"})
@@ -83,26 +113,18 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
 
     async def async_step_dynamic_windows(self, user_input=None):
         _LOGGER.debug("Step dynamic_windows called with input=%s", user_input)
-        today = date.today().strftime("%Y-%m-%d")
+        today = dt_util.now().strftime("%Y-%m-%d")
         try:
             if user_input is None:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(PERIODS_URL.format(self.location_id, today)) as resp:
-                        text = await resp.text()
-                        _LOGGER.debug("Periods response [%s]: %s", resp.status, text[:500])
-                        data = await resp.json()
-                        self.periods = (data.get("periods", []) if isinstance(data, dict) else data) or []
+                self.periods = await async_get_api(self.hass).async_get_periods(self.location_id, today)
 
                 schema_dict = {}
                 for p in self.periods:
                     slug = p.get("slug", p.get("name", "period")).lower()
-                    default_start, default_end = ("00:00", "23:59")
-                    for key, (dstart, dend) in DEFAULT_WINDOWS.items():
-                        if key in slug:
-                            default_start, default_end = dstart, dend
-                            break
+                    default_start, default_end = default_window(slug)
                     schema_dict[vol.Required(f"{slug}_start", default=default_start)] = cv.string
                     schema_dict[vol.Required(f"{slug}_end", default=default_end)] = cv.string
+                    schema_dict[vol.Required(f"{slug}_days", default=list(WEEKDAYS))] = cv.multi_select(DAY_OPTIONS)
 
                 return self.async_show_form(
                     step_id="dynamic_windows",
@@ -117,15 +139,23 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                 st = user_input[f"{slug}_start"]
                 en = user_input[f"{slug}_end"]
                 _LOGGER.debug("Validating window %s: %s-%s", slug, st, en)
-                if st < en:
-                    valid = True
+                try:
+                    if parse_time(st) != parse_time(en):
+                        valid = True
+                except ValueError:
+                    valid = False
+                    break
             if not valid:
                 errors["base"] = "invalid_time_window"
+            elif any(not user_input.get(f"{p.get('slug', p.get('name', 'period')).lower()}_days") for p in self.periods):
+                errors["base"] = "no_window_days"
+            if errors:
                 schema_dict = {}
                 for p in self.periods:
                     slug = p.get("slug", p.get("name", "period")).lower()
                     schema_dict[vol.Required(f"{slug}_start", default=user_input[f"{slug}_start"])] = cv.string
                     schema_dict[vol.Required(f"{slug}_end", default=user_input[f"{slug}_end"])] = cv.string
+                    schema_dict[vol.Required(f"{slug}_days", default=user_input.get(f"{slug}_days", []))] = cv.multi_select(DAY_OPTIONS)
                 return self.async_show_form(
                     step_id="dynamic_windows",
                     data_schema=vol.Schema(schema_dict),
@@ -140,6 +170,7 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "name": p.get("name"),
                     "start": user_input[f"{slug}_start"],
                     "end": user_input[f"{slug}_end"],
+                    "days": user_input[f"{slug}_days"],
                 }
             _LOGGER.debug("Final dynamic windows config: %s", windows)
 
@@ -155,21 +186,20 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "period_windows": windows
                 }
             )
+        except DineOnCampusApiError as e:
+            _LOGGER.error("API error in async_step_dynamic_windows: %s", e)
+            return self.async_show_form(step_id="dynamic_windows", errors={"base": "cannot_connect"})
         except Exception as e:
             _LOGGER.exception("Error in async_step_dynamic_windows: %s", e)
             return self.async_show_form(step_id="dynamic_windows", errors={"base": "unknown"})
 
     async def async_step_period(self, user_input=None):
         _LOGGER.debug("Step period called with input=%s", user_input)
-        today = date.today().strftime("%Y-%m-%d")
+        today = dt_util.now().strftime("%Y-%m-%d")
         try:
             if user_input is None:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(PERIODS_URL.format(self.location_id, today)) as resp:
-                        text = await resp.text()
-                        _LOGGER.debug("Periods response [%s]: %s", resp.status, text[:500])
-                        data = await resp.json()
-                        self.periods = {p["name"]: p["id"] for p in (data.get("periods", []) if isinstance(data, dict) else data)}
+                periods = await async_get_api(self.hass).async_get_periods(self.location_id, today)
+                self.periods = {p["name"]: p["id"] for p in periods}
                 return self.async_show_form(
                     step_id="period",
                     data_schema=vol.Schema({vol.Required("period"): vol.In(list(self.periods.keys()))}),
@@ -189,6 +219,9 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     "dynamic": False
                 }
             )
+        except DineOnCampusApiError as e:
+            _LOGGER.error("API error in async_step_period: %s", e)
+            return self.async_show_form(step_id="period", errors={"base": "cannot_connect"})
         except Exception as e:
             _LOGGER.exception("Error in async_step_period: %s", e)
             return self.async_show_form(step_id="period", errors={"base": "unknown"})
@@ -198,14 +231,25 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _LOGGER.debug("Reconfigure called with input=%s", user_input)
         entry = self._get_reconfigure_entry()
         current = entry.data
+        if current.get("site"):
+            return self.async_abort(reason="reconfigure_not_supported")
 
-        if user_input is None:
+        errors = {}
+        if user_input is not None and current.get("dynamic"):
+            if any(not user_input.get(f"{slug}_days") for slug in current.get("period_windows", {})):
+                errors["base"] = "no_window_days"
+
+        if user_input is None or errors:
             if current.get("dynamic"):
                 schema_dict = {}
                 for slug, win in current.get("period_windows", {}).items():
-                    schema_dict[vol.Required(f"{slug}_start", default=win["start"])] = cv.string
-                    schema_dict[vol.Required(f"{slug}_end", default=win["end"])] = cv.string
-                return self.async_show_form(step_id="reconfigure", data_schema=vol.Schema(schema_dict))
+                    shown = {"start": win["start"], "end": win["end"], "days": win.get("days", list(WEEKDAYS))}
+                    if user_input:
+                        shown = {field: user_input.get(f"{slug}_{field}", []) for field in ("start", "end", "days")}
+                    schema_dict[vol.Required(f"{slug}_start", default=shown["start"])] = cv.string
+                    schema_dict[vol.Required(f"{slug}_end", default=shown["end"])] = cv.string
+                    schema_dict[vol.Required(f"{slug}_days", default=shown["days"])] = cv.multi_select(DAY_OPTIONS)
+                return self.async_show_form(step_id="reconfigure", data_schema=vol.Schema(schema_dict), errors=errors)
             else:
                 return self.async_show_form(
                     step_id="reconfigure",
@@ -221,6 +265,7 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
                     **current["period_windows"][slug],
                     "start": user_input[f"{slug}_start"],
                     "end": user_input[f"{slug}_end"],
+                    "days": user_input[f"{slug}_days"],
                 }
             data = {**current, "period_windows": new_windows}
         else:
@@ -233,3 +278,24 @@ class DineOnCampusConfigFlow(config_entries.ConfigFlow, domain=DOMAIN):
         _LOGGER.debug("Reconfigure saving new data=%s", data)
         self.hass.config_entries.async_update_entry(entry, data=data)
         return self.async_abort(reason="reconfigure_success")
+
+
+class DineOnCampusOptionsFlow(config_entries.OptionsFlow):
+    """Tune how an entry fetches menus."""
+
+    async def async_step_init(self, user_input=None):
+        _LOGGER.debug("Options called with input=%s", user_input)
+        if user_input is not None:
+            return self.async_create_entry(data=user_input)
+
+        options = self.config_entry.options
+        schema = {}
+        if not self.config_entry.data.get("site"):
+            schema[vol.Required("prefetch", default=options.get("prefetch", False))] = bool
+            schema[vol.Required("prefetch_days", default=options.get("prefetch_days", 0))] = vol.All(
+                vol.Coerce(int), vol.Range(min=0, max=MAX_PREFETCH_DAYS)
+            )
+        schema[vol.Required("max_stale_hours", default=options.get("max_stale_hours", DEFAULT_MAX_STALE_HOURS))] = vol.All(
+            vol.Coerce(int), vol.Range(min=1, max=MAX_STALE_HOURS)
+        )
+        return self.async_show_form(step_id="init", data_schema=vol.Schema(schema))
@@ -0,0 +1,72 @@
+from datetime import timedelta
+
+DOMAIN = "dineoncampus"
+PLATFORMS = ["sensor", "button"]
+SITE_PLATFORMS = ["sensor", "binary_sensor", "button"]
+
+API_BASE_URL = "https://apiv4.dineoncampus.com"
+SCHOOLS_PATH = "/sites/public"
+LOCATIONS_PATH = "/locations/status_by_site?siteId={}"
+PERIODS_PATH = "/locations/{}/periods/?date={}"
+MENU_PATH = "/locations/{}/menu?date={}&period={}"
+
+SLOW_REFRESH_INTERVAL = timedelta(minutes=30)
+
+# Suggested period windows, matched against period slugs
+DEFAULT_WINDOWS = {
+    "breakfast": ("05:00", "10:30"),
+    "lunch": ("11:00", "15:00"),
+    "dinner": ("16:00", "23:00"),
+    "everyday": ("00:00", "23:59"),
+}
+REQUEST_TIMEOUT = timedelta(seconds=30)
+MAX_CONCURRENT_REQUESTS = 4
+
+# Prefetch runs daily shortly after local midnight.
+PREFETCH_TIME = {"hour": 0, "minute": 5, "second": 0}
+PREFETCH_CONCURRENCY = 4
+MAX_PREFETCH_DAYS = 7
+
+# Seconds to coalesce snapshot writes over.
+SNAPSHOT_SAVE_DELAY = 60
+
+# Request governor: steady rate and burst of the shared token bucket,
+# consecutive failures before a host's circuit opens, and its backoff bounds
+# in seconds. Each pause is drawn from the upper half of the current backoff,
+# so pauses run from 1 to 60 minutes.
+TOKEN_BUCKET_RATE = 2.0
+TOKEN_BUCKET_BURST = 10
+FAILURE_THRESHOLD = 3
+BACKOFF_BASE = 120
+BACKOFF_MAX = 3600
+
+# Upper bound of the per-location offset added to every scheduled refresh.
+POLL_JITTER = timedelta(seconds=90)
+
+# School catalog used by the config flow.
+CATALOG_SITES_TTL = timedelta(days=7)
+CATALOG_LOCATIONS_TTL = timedelta(days=1)
+CATALOG_MAX_RESULTS = 50
+
+# Whole-site entries: status poll interval, concurrent menu fetches, and
+# how many menus older than SLOW_REFRESH_INTERVAL are revalidated per poll.
+SITE_REFRESH_INTERVAL = timedelta(minutes=15)
+SITE_MENU_CONCURRENCY = 4
+SITE_REVALIDATE_BATCH = 8
+
+# Stale-while-revalidate: retry interval after a failed fetch, and how long
+# the last good data is served before entities turn unavailable.
+STALE_RETRY_INTERVAL = timedelta(minutes=5)
+DEFAULT_MAX_STALE_HOURS = 6
+MAX_STALE_HOURS = 72
+
+# Recent samples kept for latency and parse time percentiles.
+STATS_SAMPLES = 256
+
+# Menu horizon: days past today kept up to date are the prefetch_days
+# option. Menus further out than today are revalidated once they are this
+# old, a few per refresh.
+HORIZON_REFRESH_INTERVAL = timedelta(hours=6)
+HORIZON_BATCH = 2
+
+EVENT_MENU_CHANGED = "dineoncampus_menu_changed"
@@ -0,0 +1,435 @@
+import asyncio
+from datetime import timedelta
+import logging
+import random
+import time
+
+from homeassistant.core import callback
+from homeassistant.helpers.event import async_track_time_change
+from homeassistant.helpers.update_coordinator import DataUpdateCoordinator
+from homeassistant.util import dt as dt_util
+
+from .api import DineOnCampusApiError, async_get_api
+from .cache import next_local_midnight
+from .const import (
+    DOMAIN,
+    EVENT_MENU_CHANGED,
+    HORIZON_BATCH,
+    HORIZON_REFRESH_INTERVAL,
+    POLL_JITTER,
+    PREFETCH_CONCURRENCY,
+    PREFETCH_TIME,
+    SLOW_REFRESH_INTERVAL,
+    STALE_RETRY_INTERVAL,
+)
+from .models import diff_menus, parse_menu
+from .search import async_get_index
+from .stats import RequestStats
+
+_LOGGER = logging.getLogger(__name__)
+
+
+@callback
+def async_get_coordinator(hass, entry, snapshot):
+    """Return the shared coordinator for an entry's location, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    coordinators = data.setdefault("coordinators", {})
+    location_id = entry.data["location_id"]
+    coordinator = coordinators.get(location_id)
+    if coordinator is None:
+        coordinator = coordinators[location_id] = DineOnCampusCoordinator(hass, location_id, snapshot)
+    if "prefetch_unsub" not in data:
+        data["prefetch_unsub"] = async_track_time_change(
+            hass, _async_prefetch_listener(hass), **PREFETCH_TIME
+        )
+    coordinator.entries[entry.entry_id] = entry
+    coordinator.async_index_restored()
+    return coordinator
+
+
+async def async_release_coordinator(hass, entry):
+    """Drop an entry's claim on its location coordinator, shutting it down when unused."""
+    data = hass.data[DOMAIN]
+    coordinators = data["coordinators"]
+    coordinator = coordinators.get(entry.data["location_id"])
+    if coordinator is None:
+        return
+    coordinator.entries.pop(entry.entry_id, None)
+    if not coordinator.entries:
+        coordinators.pop(entry.data["location_id"])
+        await coordinator.async_shutdown()
+    if not coordinators and "prefetch_unsub" in data:
+        data.pop("prefetch_unsub")()
+
+
+def _async_prefetch_listener(hass):
+    async def _prefetch(now):
+        await async_prefetch_all(hass)
+
+    return _prefetch
+
+
+async def async_prefetch_all(hass):
+    """Prefetch every period's menu for every location with prefetch enabled."""
+    semaphore = asyncio.Semaphore(PREFETCH_CONCURRENCY)
+    coordinators = list(hass.data.get(DOMAIN, {}).get("coordinators", {}).values())
+    await asyncio.gather(
+        *(
+            coordinator.async_prefetch(coordinator.prefetch_days, semaphore)
+            for coordinator in coordinators
+            if coordinator.prefetch_days is not None
+        )
+    )
+
+
+class DineOnCampusBaseCoordinator(DataUpdateCoordinator):
+    """A coordinator whose overlapping refreshes share one in-flight fetch.
+
+    Subclasses implement ``_async_fetch(force)``, where ``force`` asks to
+    ignore the age of anything cached, and add ``_jitter`` to the intervals
+    they schedule.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.api = async_get_api(self.hass)
+        # This coordinator's own requests, also counted in the API-wide stats
+        self.stats = RequestStats(self.api.stats)
+        self._inflight = None
+        self._force = False
+        self._closed = False
+        # A stable per-coordinator phase offset keeps coordinators from polling in lockstep
+        self._jitter = timedelta(seconds=random.Random(self.name).uniform(0, POLL_JITTER.total_seconds()))
+
+    async def async_refresh_now(self):
+        """Refetch everything, whatever its age.
+
+        If a fetch is already running, wait for it instead of starting another.
+        """
+        if self._inflight is None or self._inflight.done():
+            self._force = True
+        await self.async_refresh()
+
+    async def async_shutdown(self):
+        """Stop refreshing; a fetch still running is cancelled and its results dropped."""
+        self._closed = True
+        await super().async_shutdown()
+        if self._inflight is not None:
+            self._inflight.cancel()
+
+    async def _async_update_data(self):
+        task = self._inflight
+        if task is None or task.done():
+            force, self._force = self._force, False
+            task = self._inflight = self.hass.async_create_task(
+                self._async_fetch(force), f"{self.name} fetch"
+            )
+        # Shielded so one cancelled caller does not cancel the fetch for the others
+        return await asyncio.shield(task)
+
+    async def _async_fetch(self, force):
+        raise NotImplementedError
+
+    async def _fetch_menu(self, location_id, date, period_id, period_name):
+        """Fetch and parse one menu, reporting an unparseable one as an API error."""
+        menu_payload = await self.api.async_get_menu(location_id, date, period_id, self.stats)
+        started = time.perf_counter()
+        try:
+            menu = parse_menu(menu_payload, period_name)
+        except Exception as e:
+            _LOGGER.exception("Failed to parse menu for %s: %s", period_name, e)
+            self.stats.record_error("parse")
+            raise DineOnCampusApiError(f"Unparseable menu for {period_name}") from e
+        self.stats.record_parse(time.perf_counter() - started)
+        _LOGGER.debug("Parsed %s [%s]: %s items in %s categories", period_name, period_id, menu.total, len(menu.categories))
+        return menu
+
+
+class DineOnCampusCoordinator(DineOnCampusBaseCoordinator):
+    """Menus for one location, fetched once for every entry that watches it.
+
+    ``data`` maps ``(date, period name lowercased)`` to the parsed Menu, or to
+    ``None`` when that period is not served on that date.
+    """
+
+    def __init__(self, hass, location_id, snapshot):
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=None,
+            name=f"{DOMAIN} {location_id}",
+            update_interval=SLOW_REFRESH_INTERVAL,
+        )
+        self.location_id = location_id
+        self.entries = {}
+        self.menus = dict(snapshot.restore_menus(location_id))
+        self._digests = {key: menu.digest() for key, menu in self.menus.items() if menu is not None}
+        self._snapshot = snapshot
+        self._index = async_get_index(hass)
+        self._fetched = {}
+        # Fetch times of restored menus; they still count as never fetched
+        self._restored = {key: when for key, when in snapshot.restore_fetched(location_id).items() if key in self.menus}
+        self._stale = {}
+        self._active = set()
+        self._interests = {}
+        self._indexed = False
+        self._prefetch_task = None
+        self._prefetch_days_running = 0
+        self.last_success = None
+
+    @property
+    def location_name(self):
+        for entry in self.entries.values():
+            return entry.data.get("location_name", "Dining Hall")
+        return self.location_id
+
+    @callback
+    def async_index_restored(self):
+        """Index menus restored from the snapshot, once the first entry is attached."""
+        if self._indexed:
+            return
+        self._indexed = True
+        for (date, period_key), menu in self.menus.items():
+            self._index.update_menu(self, self.location_id, self.location_name, date, period_key, menu, announce=False)
+
+    async def async_shutdown(self):
+        await super().async_shutdown()
+        if self._prefetch_task is not None:
+            self._prefetch_task.cancel()
+        self._index.remove_owner(self)
+
+    @property
+    def prefetch_days(self):
+        """Days past today to prefetch, or None when no entry enables prefetch."""
+        days = [e.options.get("prefetch_days", 0) for e in self.entries.values() if e.options.get("prefetch")]
+        return max(days) if days else None
+
+    @callback
+    def async_add_interest(self, wanted_menu, schedule=None):
+        """Register a subscriber.
+
+        ``wanted_menu`` returns the ``(date, period name)`` the subscriber wants
+        now, or None. ``schedule`` is its WindowSchedule, if it has one.
+        """
+        token = object()
+        self._interests[token] = (wanted_menu, schedule)
+
+        @callback
+        def _remove():
+            self._interests.pop(token, None)
+
+        return _remove
+
+    def digest(self, key):
+        """Return the content digest of a ``(date, period key)`` menu, or None."""
+        return self._digests.get(key)
+
+    def freshness(self, key):
+        """Return ``(last_success, stale_since)`` for a ``(date, period key)``."""
+        return self._fetched.get(key) or self._restored.get(key), self._stale.get(key)
+
+    async def async_get_menu(self, date, period_name):
+        """Return a menu from memory, fetching it first if it is not there."""
+        key = (date, period_name.lower())
+        if self.menus.get(key) is None:
+            period_id = await self.api.async_resolve_period_id(self.location_id, date, period_name, self.stats)
+            if period_id is None:
+                return None
+            self._store(key, await self._fetch_menu(self.location_id, date, period_id, period_name))
+        return self.menus[key]
+
+    def _set_menu(self, key, menu):
+        self.menus[key] = menu
+        self._index.update_menu(self, self.location_id, self.location_name, key[0], key[1], menu)
+
+    def _store(self, key, menu):
+        if self._closed:
+            return
+        self._fetched[key] = dt_util.now()
+        self._stale.pop(key, None)
+        known = key in self.menus
+        old = self.menus.get(key)
+        digest = menu.digest() if menu is not None else None
+        if known and digest == self._digests.get(key):
+            return
+        self._set_menu(key, menu)
+        self._digests[key] = digest
+        if known:
+            self._async_fire_changed(key, old, menu)
+
+    @callback
+    def _async_fire_changed(self, key, old, new):
+        added, removed = diff_menus(old, new)
+        if not added and not removed:
+            return
+        _LOGGER.debug("Menu %s changed for %s: %s added, %s removed", key, self.location_id, len(added), len(removed))
+        self.hass.bus.async_fire(
+            EVENT_MENU_CHANGED,
+            {
+                "location_id": self.location_id,
+                "location_name": self.location_name,
+                "date": key[0],
+                "period": (new or old).period,
+                "added": added,
+                "removed": removed,
+            },
+        )
+
+    def _mark_stale(self, key, now):
+        self._stale.setdefault(key, now)
+
+    def _save_snapshot(self):
+        self._snapshot.update_menus(self.location_id, self.menus, {**self._restored, **self._fetched})
+
+    def _prune(self, now):
+        # Overnight windows still show yesterday's service date after midnight.
+        oldest = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        for key in [k for k in self.menus if k[0] < oldest]:
+            del self.menus[key]
+            self._fetched.pop(key, None)
+            self._restored.pop(key, None)
+            self._stale.pop(key, None)
+            self._digests.pop(key, None)
+            self._index.remove_menu(self, self.location_id, *key)
+
+    async def async_prefetch(self, days, semaphore=None):
+        """Fetch every period's menu for today and the next ``days`` days.
+
+        Menus fetched less than ``HORIZON_REFRESH_INTERVAL`` ago are skipped.
+        Only one prefetch runs at a time: a call that asks for no more days
+        than the running one waits for it, and a call that asks for more
+        waits and then prefetches whatever the first run did not cover.
+        """
+        while True:
+            task = self._prefetch_task
+            if task is None or task.done():
+                self._prefetch_days_running = days
+                task = self._prefetch_task = self.hass.async_create_task(
+                    self._async_prefetch(days, semaphore), f"{self.name} prefetch"
+                )
+                return await asyncio.shield(task)
+            if days <= self._prefetch_days_running:
+                return await asyncio.shield(task)
+            await asyncio.wait({task})
+
+    async def _async_prefetch(self, days, semaphore):
+        semaphore = semaphore or asyncio.Semaphore(PREFETCH_CONCURRENCY)
+        now = dt_util.now()
+        jobs = []
+        for offset in range(days + 1):
+            date = (now + timedelta(days=offset)).strftime("%Y-%m-%d")
+            try:
+                periods = await self.api.async_get_periods(self.location_id, date, self.stats)
+            except DineOnCampusApiError as e:
+                _LOGGER.error("Prefetch of periods for %s on %s failed: %s", self.location_id, date, e)
+                continue
+            jobs.extend(
+                (date, p) for p in periods
+                if p.get("id") and not self._is_fresh((date, p.get("name", "").lower()), now)
+            )
+
+        async def _fetch(date, period):
+            async with semaphore:
+                menu = await self._fetch_menu(self.location_id, date, period["id"], period.get("name"))
+            self._store((date, period.get("name", "").lower()), menu)
+
+        results = await asyncio.gather(*(_fetch(date, period) for date, period in jobs), return_exceptions=True)
+        for result in results:
+            if isinstance(result, DineOnCampusApiError):
+                _LOGGER.error("Prefetch of a menu for %s failed: %s", self.location_id, result)
+            elif isinstance(result, Exception):
+                raise result
+        _LOGGER.debug("Prefetched %s menus for %s", len(jobs), self.location_id)
+        if self._closed:
+            return
+        self._prune(now)
+        self._save_snapshot()
+        self.async_update_listeners()
+
+    def _next_interval(self, now):
+        interval = next_local_midnight(now) - now
+        for _, schedule in self._interests.values():
+            if schedule is None or schedule.active(now):
+                interval = min(interval, SLOW_REFRESH_INTERVAL)
+            if schedule is not None:
+                transition = schedule.next_transition(now)
+                if transition is not None:
+                    interval = min(interval, transition - now)
+        if self._stale:
+            interval = min(interval, STALE_RETRY_INTERVAL)
+        return max(interval, timedelta(seconds=1)) + self._jitter
+
+    def _is_fresh(self, key, now):
+        fetched = self._fetched.get(key)
+        return fetched is not None and now - fetched < HORIZON_REFRESH_INTERVAL
+
+    def _horizon_due(self, now, wanted):
+        """Up to ``HORIZON_BATCH`` horizon menus to revalidate, least recently fetched first."""
+        days = self.prefetch_days
+        if days is None:
+            return {}
+        first = now.strftime("%Y-%m-%d")
+        last = (now + timedelta(days=days)).strftime("%Y-%m-%d")
+        due = [
+            key for key, menu in self.menus.items()
+            if menu is not None and first <= key[0] <= last and key not in wanted and not self._is_fresh(key, now)
+        ]
+        due.sort(key=lambda key: (key in self._fetched, self._fetched.get(key) or now))
+        return {key: self.menus[key].period for key in due[:HORIZON_BATCH]}
+
+    def _needs_fetch(self, key, now):
+        fetched = self._fetched.get(key)
+        if fetched is None or self.menus.get(key) is None or key in self._stale:
+            return True
+        return key in self._active and now - fetched >= SLOW_REFRESH_INTERVAL
+
+    async def _async_fetch(self, force):
+        now = dt_util.now()
+        self._prune(now)
+
+        wanted = {}
+        for wanted_menu, _ in self._interests.values():
+            menu_key = wanted_menu()
+            if menu_key:
+                date, name = menu_key
+                wanted.setdefault((date, name.lower()), name)
+        names = {**self._horizon_due(now, wanted), **wanted}
+
+        fetches = []
+        for key, name in names.items():
+            if key in wanted and not force and not self._needs_fetch(key, now):
+                self.stats.record_cache("menus", True)
+                continue
+            self.stats.record_cache("menus", False)
+            try:
+                period_id = await self.api.async_resolve_period_id(self.location_id, key[0], name, self.stats)
+            except DineOnCampusApiError as e:
+                _LOGGER.error("Failed to fetch periods for %s: %s", self.location_id, e)
+                self._mark_stale(key, now)
+                continue
+            if period_id:
+                _LOGGER.debug("Resolved fresh period_id=%s for %s", period_id, name)
+                fetches.append((key, self._fetch_menu(self.location_id, key[0], period_id, name)))
+            else:
+                self._store(key, None)
+
+        results = await asyncio.gather(*(fetch for _, fetch in fetches), return_exceptions=True)
+        for (key, _), menu in zip(fetches, results):
+            if isinstance(menu, DineOnCampusApiError):
+                _LOGGER.error("Failed to fetch menu for %s: %s", names[key], menu)
+                self._mark_stale(key, now)
+            elif isinstance(menu, Exception):
+                raise menu
+            else:
+                self._store(key, menu)
+
+        self._active = set(wanted)
+        # Only wanted menus are retried early; the rest wait until they are wanted again
+        self._stale = {key: since for key, since in self._stale.items() if key in wanted}
+        if not self._stale:
+            self.last_success = now
+        self.update_interval = self._next_interval(now)
+        _LOGGER.debug("Next refresh of %s in %s", self.location_id, self.update_interval)
+        if fetches and not self._closed:
+            self._save_snapshot()
+        return self.menus
@@ -0,0 +1,62 @@
+from .api import async_get_api
+from .const import DOMAIN
+
+
+def _isoformat(value):
+    return value.isoformat() if value else None
+
+
+def _location_diagnostics(coordinator):
+    menus = {}
+    for key, menu in sorted(coordinator.menus.items()):
+        last_success, stale_since = coordinator.freshness(key)
+        menus["|".join(key)] = {
+            "items": menu.total if menu else None,
+            "last_success": _isoformat(last_success),
+            "stale_since": _isoformat(stale_since),
+        }
+    return {
+        "location_id": coordinator.location_id,
+        "entries": len(coordinator.entries),
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "last_success": _isoformat(coordinator.last_success),
+        "menus": menus,
+    }
+
+
+def _site_diagnostics(coordinator):
+    locations = coordinator.data or {}
+    return {
+        "site_id": coordinator.site_id,
+        "update_interval": str(coordinator.update_interval),
+        "last_update_success": coordinator.last_update_success,
+        "last_success": _isoformat(coordinator.last_success),
+        "stale_since": _isoformat(coordinator.stale_since),
+        "locations": len(locations),
+        "open_locations": sum(1 for location in locations.values() if location.is_open),
+    }
+
+
+async def async_get_config_entry_diagnostics(hass, entry):
+    """Return diagnostics for a config entry.
+
+    ``requests`` counts the entry's coordinator; ``api`` counts every entry
+    of the integration.
+    """
+    api = async_get_api(hass)
+    data = hass.data[DOMAIN]
+    if entry.data.get("site"):
+        coordinator = data["sites"][entry.entry_id]
+        info = _site_diagnostics(coordinator)
+    else:
+        coordinator = data["entries"][entry.entry_id]
+        info = _location_diagnostics(coordinator)
+    return {
+        "entry": {"data": dict(entry.data), "options": dict(entry.options)},
+        "coordinator": info,
+        "requests": coordinator.stats.as_dict(),
+        "api": api.stats.as_dict(),
+        "governor": api.governor.as_dict(),
+        "periods_cached_locations": len(api.periods.as_dict()),
+    }
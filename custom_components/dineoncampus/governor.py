@@ -0,0 +1,140 @@
+import asyncio
+from email.utils import parsedate_to_datetime
+import logging
+import random
+import time
+
+from homeassistant.util import dt as dt_util
+
+from .const import (
+    BACKOFF_BASE,
+    BACKOFF_MAX,
+    FAILURE_THRESHOLD,
+    TOKEN_BUCKET_BURST,
+    TOKEN_BUCKET_RATE,
+)
+
+_LOGGER = logging.getLogger(__name__)
+
+
+def parse_retry_after(value):
+    """Return the seconds a ``Retry-After`` header asks for, or None."""
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, (parsedate_to_datetime(value) - dt_util.utcnow()).total_seconds())
+    except (TypeError, ValueError):
+        return None
+
+
+class _Breaker:
+    """Circuit breaker state for one host."""
+
+    __slots__ = ("failures", "open_until", "probing")
+
+    def __init__(self):
+        self.failures = 0
+        self.open_until = 0.0
+        self.probing = False
+
+
+class RequestGovernor:
+    """Admission control shared by every request the integration makes.
+
+    A token bucket smooths bursts to ``TOKEN_BUCKET_RATE`` requests per
+    second. Each host has a circuit breaker that opens after
+    ``FAILURE_THRESHOLD`` consecutive failures, or at once when the server
+    sends ``Retry-After``. It stays open for an exponentially growing,
+    jittered backoff, or for however long ``Retry-After`` asks. While it is
+    open, requests fail fast without touching the network. Once the backoff
+    has passed, a single probe is let through, and its result closes the
+    breaker or opens it again. The probe slot is only taken together with a
+    token, so a request cancelled while it waits never holds it.
+    """
+
+    def __init__(self):
+        self._tokens = float(TOKEN_BUCKET_BURST)
+        self._updated = time.monotonic()
+        self._lock = asyncio.Lock()
+        self._breakers = {}
+        self.opens = 0
+
+    def retry_in(self, host):
+        """Seconds until ``host`` accepts requests again, or 0 if it does now."""
+        breaker = self._breakers.get(host)
+        if breaker is None:
+            return 0.0
+        return max(0.0, breaker.open_until - time.monotonic())
+
+    def _rejects(self, breaker):
+        """Whether ``breaker`` refuses a request now; a request it lets through while tripped is the probe."""
+        if breaker.failures < FAILURE_THRESHOLD and not breaker.open_until:
+            return False
+        return time.monotonic() < breaker.open_until or breaker.probing
+
+    async def async_acquire(self, host):
+        """Wait for a token. Return False if the host's breaker rejects the request."""
+        if self._rejects(self._breakers.setdefault(host, _Breaker())):
+            return False
+
+        async with self._lock:
+            while True:
+                now = time.monotonic()
+                self._tokens = min(TOKEN_BUCKET_BURST, self._tokens + (now - self._updated) * TOKEN_BUCKET_RATE)
+                self._updated = now
+                if self._tokens >= 1:
+                    break
+                await asyncio.sleep((1 - self._tokens) / TOKEN_BUCKET_RATE)
+
+            # The breaker may have tripped, or another probe started, while this request waited
+            breaker = self._breakers.setdefault(host, _Breaker())
+            if self._rejects(breaker):
+                return False
+            if breaker.failures >= FAILURE_THRESHOLD or breaker.open_until:
+                breaker.probing = True
+            self._tokens -= 1
+            return True
+
+    def record_success(self, host):
+        breaker = self._breakers.get(host)
+        if breaker is not None and (breaker.failures or breaker.open_until):
+            _LOGGER.info("DineOnCampus API at %s recovered", host)
+        self._breakers[host] = _Breaker()
+
+    def record_failure(self, host, retry_after=None):
+        breaker = self._breakers.setdefault(host, _Breaker())
+        breaker.failures += 1
+        breaker.probing = False
+        if retry_after is None and breaker.failures < FAILURE_THRESHOLD:
+            return
+        if retry_after is None:
+            backoff = min(BACKOFF_MAX, BACKOFF_BASE * 2 ** (breaker.failures - FAILURE_THRESHOLD))
+            retry_after = random.uniform(backoff / 2, backoff)
+        breaker.open_until = time.monotonic() + retry_after
+        self.opens += 1
+        _LOGGER.warning(
+            "Pausing DineOnCampus API requests to %s for %.0f seconds (%s consecutive failures)",
+            host,
+            retry_after,
+            breaker.failures,
+        )
+
+    def as_dict(self):
+        return {
+            "tokens": round(self._tokens, 2),
+            "circuit_opens": self.opens,
+            "hosts": {
+                host: {"failures": breaker.failures, "retry_in": round(self.retry_in(host))}
+                for host, breaker in self._breakers.items()
+            },
+        }
+
+    def release(self, host):
+        """Give back a probe slot without recording an outcome (e.g. on cancellation)."""
+        breaker = self._breakers.get(host)
+        if breaker is not None:
+            breaker.probing = False
@@ -0,0 +1,165 @@
+from dataclasses import dataclass
+import hashlib
+import json
+import sys
+
+
+@dataclass(slots=True, frozen=True)
+class Item:
+    name: str
+    labels: tuple = ()
+    allergens: tuple = ()
+
+
+@dataclass(slots=True, frozen=True)
+class Category:
+    name: str
+    items: tuple
+
+
+@dataclass(slots=True, frozen=True)
+class Menu:
+    """A parsed period menu, holding only the fields the integration uses."""
+
+    period: str
+    categories: tuple = ()
+
+    @property
+    def total(self):
+        return sum(len(category.items) for category in self.categories)
+
+    def item_names(self):
+        """Return ``{category name: (item names, ...)}``."""
+        return {category.name: tuple(item.name for item in category.items) for category in self.categories}
+
+    def item_keys(self):
+        """Return the set of ``(category name, item name)`` on the menu."""
+        return {(category.name, item.name) for category in self.categories for item in category.items}
+
+    def digest(self):
+        """Hash of the menu's content, ignoring order, stable across restarts."""
+        normalized = sorted(
+            (category.name, sorted((item.name, sorted(item.labels), sorted(item.allergens)) for item in category.items))
+            for category in self.categories
+        )
+        return hashlib.sha1(json.dumps([self.period, normalized], separators=(",", ":")).encode()).hexdigest()
+
+    def as_dict(self):
+        return {
+            "period": self.period,
+            "categories": [
+                {
+                    "name": category.name,
+                    "items": [
+                        {"name": item.name, "labels": list(item.labels), "allergens": list(item.allergens)}
+                        for item in category.items
+                    ],
+                }
+                for category in self.categories
+            ],
+        }
+
+    @classmethod
+    def from_dict(cls, data):
+        return cls(
+            sys.intern(data.get("period") or ""),
+            tuple(
+                Category(
+                    sys.intern(category["name"]),
+                    tuple(
+                        Item(
+                            sys.intern(item["name"]),
+                            tuple(sys.intern(label) for label in item.get("labels", ())),
+                            tuple(sys.intern(allergen) for allergen in item.get("allergens", ())),
+                        )
+                        for item in category.get("items", ())
+                    ),
+                )
+                for category in data.get("categories", ())
+            ),
+        )
+
+
+def diff_menus(old, new):
+    """Return ``(added, removed)`` item lists between two menus, either of which may be None."""
+    old_items = old.item_keys() if old else set()
+    new_items = new.item_keys() if new else set()
+    return (
+        [{"category": category, "name": name} for category, name in sorted(new_items - old_items)],
+        [{"category": category, "name": name} for category, name in sorted(old_items - new_items)],
+    )
+
+
+@dataclass(slots=True)
+class SiteLocation:
+    """A location's live status from ``status_by_site``, plus its current menu."""
+
+    id: str
+    name: str
+    is_open: bool
+    status: str
+    period: str = None
+    menu: Menu = None
+
+
+def parse_location_status(data):
+    """Build a SiteLocation from one ``status_by_site`` entry, or None if unusable."""
+    if not isinstance(data, dict) or not data.get("id"):
+        return None
+    status = data.get("status") or {}
+    if isinstance(status, dict):
+        label = status.get("label") or ""
+        message = status.get("message") or label
+    else:
+        label = message = str(status)
+    return SiteLocation(
+        str(data["id"]),
+        sys.intern(data.get("name") or str(data["id"])),
+        label.lower() == "open",
+        message,
+    )
+
+
+def _parse_filters(filters):
+    """Split an item's filters into dietary labels and allergens."""
+    labels = []
+    allergens = []
+    for f in filters or []:
+        name = f.get("name") if isinstance(f, dict) else None
+        if not name:
+            continue
+        if f.get("type") == "allergen":
+            allergens.append(sys.intern(name))
+        else:
+            labels.append(sys.intern(name))
+    return tuple(labels), tuple(allergens)
+
+
+def parse_menu(payload, period_name):
+    """Build a Menu from a decoded menu response.
+
+    Strings are interned: item, category and label names repeat across
+    periods, days and locations.
+    """
+    period = payload.get("period") if isinstance(payload, dict) else None
+    categories = []
+    for cat in (period or {}).get("categories", []) or []:
+        items = []
+        for it in cat.get("items", []) or []:
+            labels, allergens = _parse_filters(it.get("filters"))
+            items.append(Item(sys.intern(it.get("name") or ""), labels, allergens))
+        categories.append(Category(sys.intern(cat.get("name") or "Unknown"), tuple(items)))
+    return Menu(sys.intern(period_name or ""), tuple(categories))
+
+
+class LazyTruncated:
+    """Formats the start of a response body only if a log record is emitted."""
+
+    __slots__ = ("_body", "_limit")
+
+    def __init__(self, body, limit=500):
+        self._body = body
+        self._limit = limit
+
+    def __str__(self):
+        return self._body[: self._limit].decode("utf-8", "replace")
@@ -0,0 +1,135 @@
+from bisect import bisect_right
+from datetime import timedelta
+import logging
+
+from homeassistant.util import dt as dt_util
+
+from .const import DEFAULT_WINDOWS
+
+_LOGGER = logging.getLogger(__name__)
+
+MINUTES_PER_DAY = 24 * 60
+WEEKDAYS = ("mon", "tue", "wed", "thu", "fri", "sat", "sun")
+
+
+def parse_time(value):
+    """Parse ``HH:MM`` into minutes after midnight, raising ValueError if malformed."""
+    hours, _, minutes = str(value).strip().partition(":")
+    hours, minutes = int(hours), int(minutes)
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid time {value!r}")
+    return hours * 60 + minutes
+
+
+def default_window(slug):
+    """Return the suggested ``(start, end)`` for a period slug."""
+    for key, window in DEFAULT_WINDOWS.items():
+        if key in slug:
+            return window
+    return "00:00", "23:59"
+
+
+def default_windows(periods):
+    """Build a ``period_windows`` mapping for periods using the suggested times."""
+    windows = {}
+    for p in periods:
+        slug = p.get("slug", p.get("name", "period")).lower()
+        start, end = default_window(slug)
+        windows[slug] = {"id": p.get("id"), "name": p.get("name"), "start": start, "end": end}
+    return windows
+
+
+def _parse_days(days):
+    if not days:
+        return range(7)
+    parsed = set()
+    for day in days:
+        if isinstance(day, int):
+            parsed.add(day % 7)
+        else:
+            parsed.add(WEEKDAYS.index(str(day).lower()[:3]))
+    return sorted(parsed)
+
+
+class Window:
+    """One configured period window."""
+
+    __slots__ = ("slug", "id", "name", "start", "end")
+
+    def __init__(self, slug, period_id, name, start, end):
+        self.slug = slug
+        self.id = period_id
+        self.name = name
+        self.start = start
+        self.end = end
+
+    @property
+    def overnight(self):
+        return self.end <= self.start
+
+
+class WindowSchedule:
+    """Period windows compiled once into a per-weekday interval index.
+
+    ``windows`` is the ``period_windows`` mapping stored in the config entry.
+    Each window has ``HH:MM`` ``start`` and ``end`` times, where the end minute
+    is inclusive. It may also have a ``days`` list of weekday names or numbers
+    (Monday is 0). A window whose end is not after its start runs past
+    midnight, and the part after midnight belongs to the previous day's service
+    date.
+    """
+
+    def __init__(self, windows):
+        self.windows = []
+        # weekday -> sorted [(start, end, window, day offset of service date)]
+        self._intervals = {day: [] for day in range(7)}
+        for slug, win in (windows or {}).items():
+            try:
+                start = parse_time(win["start"])
+                end = parse_time(win["end"]) + 1
+                days = _parse_days(win.get("days"))
+            except (KeyError, ValueError) as e:
+                _LOGGER.debug("Bad window for %s: %s", slug, e)
+                continue
+            window = Window(slug, win.get("id"), win.get("name") or slug, start, end)
+            self.windows.append(window)
+            for day in days:
+                if window.overnight:
+                    self._intervals[day].append((start, MINUTES_PER_DAY, window, 0))
+                    if end % MINUTES_PER_DAY:
+                        self._intervals[(day + 1) % 7].append((0, end % MINUTES_PER_DAY, window, -1))
+                else:
+                    self._intervals[day].append((start, end, window, 0))
+
+        self._starts = {}
+        self._boundaries = {}
+        for day, intervals in self._intervals.items():
+            intervals.sort(key=lambda interval: interval[:2])
+            self._starts[day] = [interval[0] for interval in intervals]
+            self._boundaries[day] = sorted({b for interval in intervals for b in interval[:2]})
+
+    def active(self, now=None):
+        """Return ``(window, service date)`` for the window covering ``now``, else None."""
+        now = now or dt_util.now()
+        day = now.weekday()
+        minute = now.hour * 60 + now.minute
+        intervals = self._intervals[day]
+        for start, end, window, offset in reversed(intervals[: bisect_right(self._starts[day], minute)]):
+            if start <= minute < end:
+                return window, (now + timedelta(days=offset)).date()
+        return None
+
+    def next_transition(self, now=None):
+        """Return the next time a window opens or closes after ``now``, if any."""
+        now = now or dt_util.now()
+        minute = now.hour * 60 + now.minute
+        for days_ahead in range(8):
+            boundaries = self._boundaries[(now.weekday() + days_ahead) % 7]
+            index = bisect_right(boundaries, minute) if days_ahead == 0 else 0
+            if index < len(boundaries):
+                boundary = boundaries[index]
+                day_start = dt_util.start_of_local_day((now + timedelta(days=days_ahead)).date())
+                if boundary >= MINUTES_PER_DAY:
+                    return dt_util.start_of_local_day((day_start + timedelta(days=1, hours=12)).date())
+                return day_start.replace(hour=boundary // 60, minute=boundary % 60)
+        return None
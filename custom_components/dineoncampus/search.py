@@ -0,0 +1,147 @@
+import re
+
+from homeassistant.core import callback
+from homeassistant.helpers.dispatcher import async_dispatcher_send
+
+from .const import DOMAIN
+
+SIGNAL_ITEMS_ADDED = f"{DOMAIN}_items_added"
+
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+
+
+def tokenize(text):
+    return set(_TOKEN_RE.findall(str(text or "").lower()))
+
+
+@callback
+def async_get_index(hass):
+    """Return the integration-wide item index, creating it on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    index = data.get("index")
+    if index is None:
+        index = data["index"] = MenuIndex(hass)
+    return index
+
+
+class MenuItem:
+    """One item on one menu, as stored in the index."""
+
+    __slots__ = ("location_id", "location_name", "date", "period", "category", "name", "labels", "allergens")
+
+    def __init__(self, location_id, location_name, date, period, category, name, labels, allergens):
+        self.location_id = location_id
+        self.location_name = location_name
+        self.date = date
+        self.period = period
+        self.category = category
+        self.name = name
+        self.labels = labels
+        self.allergens = allergens
+
+    def matches(self, labels=(), exclude_allergens=()):
+        """Whether the item carries every label and none of the allergens (case-insensitive)."""
+        own_labels = {label.lower() for label in self.labels}
+        own_allergens = {allergen.lower() for allergen in self.allergens}
+        return (
+            all(label.lower() in own_labels for label in labels)
+            and not any(allergen.lower() in own_allergens for allergen in exclude_allergens)
+        )
+
+    def as_dict(self):
+        return {
+            "location_id": self.location_id,
+            "location_name": self.location_name,
+            "date": self.date,
+            "period": self.period,
+            "category": self.category,
+            "item": self.name,
+            "labels": list(self.labels),
+            "allergens": list(self.allergens),
+        }
+
+
+class MenuIndex:
+    """Inverted index from item name tokens to items on every menu in memory.
+
+    Coordinators replace a menu's items whenever they store it, so the index
+    covers every configured location and every prefetched date. A lookup
+    intersects one posting set per query token, starting with the smallest,
+    so its cost follows the number of matches rather than the number of
+    menus. Items that were not on the previous version of a menu are
+    announced on ``SIGNAL_ITEMS_ADDED``.
+
+    Every menu is indexed on behalf of an ``owner``, the coordinator that
+    stored it. A location coordinator and a whole-site coordinator can both
+    index the same menu; each one's copy lives and is removed independently,
+    and search results list the item once.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._postings = {}
+        self._menus = {}
+
+    def update_menu(self, owner, location_id, location_name, date, period_key, menu, announce=True):
+        """Index a menu, replacing whatever ``owner`` indexed for the same key."""
+        key = (location_id, date, period_key)
+        old = {(item.category, item.name) for items in self._menus.get(key, {}).values() for item in items}
+        self.remove_menu(owner, location_id, date, period_key)
+        if not menu:
+            return
+
+        period = menu.period or period_key
+        items = []
+        for category in menu.categories:
+            for it in category.items:
+                item = MenuItem(
+                    location_id, location_name, date, period, category.name, it.name, it.labels, it.allergens
+                )
+                items.append(item)
+                for token in tokenize(it.name):
+                    self._postings.setdefault(token, set()).add(item)
+        self._menus.setdefault(key, {})[owner] = items
+
+        added = [item for item in items if (item.category, item.name) not in old]
+        if added and announce:
+            async_dispatcher_send(self._hass, SIGNAL_ITEMS_ADDED, added)
+
+    def remove_menu(self, owner, location_id, date, period_key):
+        key = (location_id, date, period_key)
+        owners = self._menus.get(key)
+        if owners is None:
+            return
+        for item in owners.pop(owner, ()):
+            for token in tokenize(item.name):
+                postings = self._postings.get(token)
+                if postings is not None:
+                    postings.discard(item)
+                    if not postings:
+                        del self._postings[token]
+        if not owners:
+            del self._menus[key]
+
+    def remove_owner(self, owner):
+        """Remove every menu ``owner`` indexed."""
+        for key in [k for k, owners in self._menus.items() if owner in owners]:
+            self.remove_menu(owner, *key)
+
+    def search(self, query, location_id=None, date=None, labels=(), exclude_allergens=()):
+        """Return items whose names contain every word of ``query``."""
+        tokens = tokenize(query)
+        if not tokens:
+            return []
+        postings = sorted((self._postings.get(token, set()) for token in tokens), key=len)
+        found = postings[0].intersection(*postings[1:])
+        # The same menu may be indexed by more than one owner
+        unique = {
+            (item.location_id, item.date, item.period, item.category, item.name): item
+            for item in found
+            if (location_id is None or item.location_id == location_id)
+            and (date is None or item.date == date)
+            and item.matches(labels, exclude_allergens)
+        }
+        return sorted(
+            unique.values(),
+            key=lambda item: (item.date, item.location_name, item.period, item.category, item.name),
+        )
@@ -1,35 +1,86 @@
-import aiohttp
-from datetime import datetime, timedelta
-from homeassistant.components.sensor import SensorEntity
+from homeassistant.components.sensor import SensorDeviceClass, SensorEntity, SensorStateClass
+from homeassistant.const import PERCENTAGE, EntityCategory, UnitOfInformation, UnitOfTime
+from homeassistant.core import callback
+from homeassistant.helpers.update_coordinator import CoordinatorEntity
 from homeassistant.util import dt as dt_util
+from datetime import timedelta
 import logging
 import re
 
-_LOGGER = logging.getLogger(__name__)
+from .const import DEFAULT_MAX_STALE_HOURS, DOMAIN
+from .schedule import WindowSchedule
 
-MENU_URL = "https://apiv4.dineoncampus.com/locations/{}/menu?date={}&period={}"
-PERIODS_URL = "https://apiv4.dineoncampus.com/locations/{}/periods/?date={}"
-SCAN_INTERVAL = timedelta(minutes=5)
+_LOGGER = logging.getLogger(__name__)
 
 async def async_setup_entry(hass, entry, async_add_entities):
     _LOGGER.debug("Setting up DineOnCampus sensor with config: %s", entry.data)
-    main = DineOnCampusMenuSensor(entry.data)
-    async_add_entities([main], True)
+    if entry.data.get("site"):
+        _setup_site_sensors(hass, entry, async_add_entities)
+        _setup_diagnostic_sensors(hass, entry, hass.data[DOMAIN]["sites"][entry.entry_id], async_add_entities)
+        return
+
+    coordinator = hass.data[DOMAIN]["entries"][entry.entry_id]
+    snapshot = hass.data[DOMAIN]["snapshot"]
+    max_stale = timedelta(hours=entry.options.get("max_stale_hours", DEFAULT_MAX_STALE_HOURS))
+    main = DineOnCampusMenuSensor(coordinator, snapshot, entry.data, max_stale)
+    main._update_from_coordinator()
+    spawned = set()
+
+    @callback
+    def _spawn_categories(names):
+        names = [cname for cname in names if cname not in spawned]
+        if names:
+            spawned.update(names)
+            async_add_entities([DineOnCampusCategorySensor(main, cname) for cname in names])
+            _LOGGER.debug("Spawned category sensors: %s", names)
+
+    @callback
+    def _reconcile_categories():
+        # Vanished categories mark themselves unavailable; only new ones need adding
+        _spawn_categories(list(main._attrs.get("categories", {})))
+
+    # Categories known from the snapshot exist immediately, before any fetch
+    async_add_entities([main])
+    _spawn_categories(snapshot.categories.get(main.unique_id, []) + list(main._attrs.get("categories", {})))
+    entry.async_on_unload(main.async_add_listener(_reconcile_categories))
+    _setup_diagnostic_sensors(hass, entry, coordinator, async_add_entities)
+
+def _setup_site_sensors(hass, entry, async_add_entities):
+    coordinator = hass.data[DOMAIN]["sites"][entry.entry_id]
+    known = set()
+
+    @callback
+    def _add_locations():
+        new = [location for location_id, location in coordinator.data.items() if location_id not in known]
+        if new:
+            known.update(location.id for location in new)
+            async_add_entities([DineOnCampusSiteMenuSensor(coordinator, entry, location) for location in new])
+            _LOGGER.debug("Added site menu sensors for %s", [location.name for location in new])
 
-    async def _spawn_categories():
-        cats = main._attrs.get("categories", {})
-        entities = [DineOnCampusCategorySensor(main, cname) for cname in cats]
-        if entities:
-            async_add_entities(entities, True)
-            _LOGGER.debug("Spawned category sensors: %s", list(cats.keys()))
+    _add_locations()
+    entry.async_on_unload(coordinator.async_add_listener(_add_locations))
 
-    # Delay until main has updated once
-    hass.loop.call_later(5, lambda: hass.async_create_task(_spawn_categories()))
+def _setup_diagnostic_sensors(hass, entry, coordinator, async_add_entities):
+    async_add_entities([DineOnCampusDiagnosticSensor(coordinator, entry, key) for key in DIAGNOSTIC_SENSORS])
 
-class DineOnCampusMenuSensor(SensorEntity):
-    _attr_should_poll = True
+class DineOnCampusMenuSensor(CoordinatorEntity, SensorEntity):
+    """Menu for one location, fed by the location's shared coordinator.
 
-    def __init__(self, config):
+    While fetches fail the last good menu stays up, with ``stale_since`` set.
+    The sensor only turns unavailable once that menu is older than
+    ``max_stale``.
+
+    State is written only when what it shows changes: the period, the menu's
+    digest, a successful fetch, staleness or availability.
+    """
+
+    # Full menus are large; the dineoncampus.get_menu service returns them on demand
+    _unrecorded_attributes = frozenset({"categories", "windows"})
+
+    def __init__(self, coordinator, snapshot, config, max_stale):
+        super().__init__(coordinator)
+        self._snapshot = snapshot
+        self._max_stale = max_stale
         self._school_id = config["school_id"]
         self._location_id = config["location_id"]
         self._location_name = config.get("location_name", "Dining Hall")
@@ -37,6 +88,7 @@ class DineOnCampusMenuSensor(SensorEntity):
         self._period_name = config.get("period_name", "")
         self._dynamic = config.get("dynamic", False)
         self._windows = config.get("period_windows", {})
+        self._schedule = WindowSchedule(self._windows) if self._dynamic else None
 
         if self._dynamic:
             self._attr_name = f"{self._location_name} (Current Menu)"
@@ -52,106 +104,121 @@ class DineOnCampusMenuSensor(SensorEntity):
 
         self._state = None
         self._attrs = {}
-        self._last_good_attrs = {}
-        self._last_good_state = None
+        self._listeners = []
+        self._expired = False
+        self._digest = None
+        self._written = None
+
+    @property
+    def available(self):
+        return super().available and not self._expired
+
+    @property
+    def native_value(self):
+        return self._state
 
     @property
     def extra_state_attributes(self):
         return self._attrs
 
-    async def _fetch_json(self, url: str):
-        async with aiohttp.ClientSession() as session:
-            async with session.get(url) as resp:
-                text = await resp.text()
-                if resp.status != 200:
-                    _LOGGER.error("API %s -> HTTP %s: %s", url, resp.status, text)
-                    return {}
-                try:
-                    return await resp.json()
-                except Exception as e:
-                    _LOGGER.error("JSON parse error for %s: %s", url, e)
-                    return {}
-
-    async def _resolve_period_id(self, today: str, period_name: str):
-        payload = await self._fetch_json(PERIODS_URL.format(self._location_id, today))
-        periods = payload.get("periods", []) if isinstance(payload, dict) else payload
-        for p in periods or []:
-            if p.get("name", "").lower() == period_name.lower():
-                return p.get("id")
-        return None
-
-    def _match_period_by_time(self):
-        now = dt_util.now().time()
-        for slug, win in self._windows.items():
-            try:
-                st = datetime.strptime(win["start"], "%H:%M").time()
-                en = datetime.strptime(win["end"], "%H:%M").time()
-                if st <= now <= en:
-                    return win["id"], win["name"]
-            except Exception as e:
-                _LOGGER.debug("Bad window for %s: %s", slug, e)
-        return None, None
-
-    async def async_update(self):
-        today = dt_util.now().strftime("%Y-%m-%d")
-        period_id = self._period_id
-        period_name = self._period_name
-        base_name = self._location_name
-
-        if not self._dynamic and self._period_name:
-            resolved_id = await self._resolve_period_id(today, self._period_name)
-            if resolved_id:
-                period_id = resolved_id
-                _LOGGER.debug("Resolved fresh period_id=%s for %s", resolved_id, self._period_name)
-            else:
-                self._state = 0
-                self._attrs = {"categories": {}, "period": self._period_name, "active_period": self._period_name, "windows": self._windows}
-                return
-
+    def _wanted_menu(self):
+        """``(date, period name)`` this sensor should show right now, or None."""
+        now = dt_util.now()
         if self._dynamic:
-            pid, pname = self._match_period_by_time()
-            if not pid:
-                self._state = 0
-                self._attrs = {"categories": {}, "period": "", "active_period": None, "windows": self._windows}
-                return
-            period_id, period_name = pid, pname
-            resolved_id = await self._resolve_period_id(today, period_name)
-            if resolved_id:
-                period_id = resolved_id
-                _LOGGER.debug("Resolved fresh period_id=%s for %s", resolved_id, period_name)
-            else:
-                self._state = 0
-                self._attrs = {"categories": {}, "period": period_name, "active_period": period_name, "windows": self._windows}
-                return
-
-        try:
-            menu_payload = await self._fetch_json(MENU_URL.format(self._location_id, today, period_id))
-            _LOGGER.debug("Menu payload for %s [%s]: %s", period_name, period_id, str(menu_payload)[:500])
-
-            categories = {}
-            total = 0
-            period = menu_payload.get("period", {}) if isinstance(menu_payload, dict) else {}
-            for cat in period.get("categories", []) or []:
-                cname = cat.get("name", "Unknown")
-                items = [it.get("name") for it in (cat.get("items", []) or [])]
-                categories[cname] = items
-                total += len(items)
-
-            self._state = total
+            active = self._schedule.active(now)
+            if active is None:
+                return None
+            window, service_date = active
+            return service_date.strftime("%Y-%m-%d"), window.name
+        if not self._period_name:
+            return None
+        return now.strftime("%Y-%m-%d"), self._period_name
+
+    async def async_added_to_hass(self):
+        await super().async_added_to_hass()
+        self.async_on_remove(self.coordinator.async_add_interest(self._wanted_menu, self._schedule))
+        self._update_from_coordinator()
+        self.hass.async_create_task(self.coordinator.async_request_refresh())
+
+    @callback
+    def async_add_listener(self, update_callback):
+        """Call ``update_callback`` right after this sensor writes new state."""
+        self._listeners.append(update_callback)
+
+        @callback
+        def _remove():
+            if update_callback in self._listeners:
+                self._listeners.remove(update_callback)
+
+        return _remove
+
+    @callback
+    def _handle_coordinator_update(self):
+        self._update_from_coordinator()
+        written = (
+            self.available,
+            self._state,
+            self._attrs.get("period"),
+            self._digest,
+            self._attrs.get("last_success"),
+            self._attrs.get("stale_since"),
+        )
+        if written == self._written:
+            return
+        self._written = written
+        super()._handle_coordinator_update()
+        for update_callback in list(self._listeners):
+            update_callback()
+
+    def _update_from_coordinator(self):
+        self._expired = False
+        self._digest = None
+        wanted = self._wanted_menu()
+        if wanted is None:
+            self._state = 0
+            self._attrs = {"categories": {}, "period": "", "active_period": None, "windows": self._windows}
+            return
+
+        date, period_name = wanted
+        key = (date, period_name.lower())
+        last_success, stale_since = self.coordinator.freshness(key)
+        if stale_since is not None:
+            self._expired = dt_util.now() - (last_success or stale_since) > self._max_stale
+        freshness = {
+            "last_success": last_success.isoformat() if last_success else None,
+            "stale_since": stale_since.isoformat() if stale_since else None,
+        }
+
+        menu = self.coordinator.menus.get(key)
+        self._digest = self.coordinator.digest(key)
+        if menu is None:
+            self._state = None if stale_since else 0
             self._attrs = {
-                "categories": categories,
+                "categories": {},
                 "period": period_name,
                 "active_period": period_name,
                 "windows": self._windows,
+                **freshness,
             }
+            return
 
-        except Exception as e:
-            _LOGGER.exception("Failed to parse menu for %s: %s", period_name, e)
-            self._state = 0
-            self._attrs = {"categories": {}, "period": period_name or "", "active_period": period_name, "windows": self._windows}
+        categories = menu.item_names()
+        self._state = menu.total
+        if categories:
+            self._snapshot.update_categories(self._attr_unique_id, list(categories))
+        self._attrs = {
+            "categories": categories,
+            "period": period_name,
+            "active_period": period_name,
+            "windows": self._windows,
+            **freshness,
+        }
 
 class DineOnCampusCategorySensor(SensorEntity):
-    """One sensor per menu category."""
+    """One sensor per menu category, pushed by its parent menu sensor."""
+
+    _attr_should_poll = False
+    _unrecorded_attributes = frozenset({"items"})
 
     def __init__(self, parent, category_name):
         self._parent = parent
@@ -163,12 +230,176 @@ class DineOnCampusCategorySensor(SensorEntity):
         self._state = None
         self._attrs = {}
 
-    async def async_update(self):
+    async def async_added_to_hass(self):
+        self.async_on_remove(self._parent.async_add_listener(self._handle_parent_update))
+        self._update_from_parent()
+
+    @callback
+    def _handle_parent_update(self):
+        self._update_from_parent()
+        self.async_write_ha_state()
+
+    def _update_from_parent(self):
         cats = self._parent._attrs.get("categories", {})
+        # A category missing from the current menu stays registered but unavailable
+        self._attr_available = self._parent.available and self._category in cats
         items = cats.get(self._category, [])
         self._state = len(items)
         self._attrs = {"items": items}
 
+    @property
+    def native_value(self):
+        return self._state
+
     @property
     def extra_state_attributes(self):
         return self._attrs
+
+class DineOnCampusSiteMenuSensor(CoordinatorEntity, SensorEntity):
+    """Current menu of one location in a whole-site entry; 0 while it is closed."""
+
+    _unrecorded_attributes = frozenset({"categories"})
+
+    def __init__(self, coordinator, entry, location):
+        super().__init__(coordinator)
+        self._location_id = location.id
+        self._attr_name = f"{location.name} Menu"
+        self._attr_unique_id = f"{entry.data['school_id']}_{location.id}_site"
+        slug = re.sub(r'[^a-zA-Z0-9]+', '_', self._attr_name).lower().strip("_")
+        self.entity_id = f"sensor.{slug}"
+
+    @property
+    def _location(self):
+        return self.coordinator.data.get(self._location_id)
+
+    @property
+    def available(self):
+        return super().available and self._location is not None
+
+    @property
+    def native_value(self):
+        location = self._location
+        if location is None:
+            return None
+        return location.menu.total if location.is_open and location.menu else 0
+
+    @property
+    def extra_state_attributes(self):
+        location = self._location
+        if location is None:
+            return {}
+        menu = location.menu if location.is_open else None
+        return {
+            "open": location.is_open,
+            "status": location.status,
+            "period": location.period if menu else None,
+            "categories": menu.item_names() if menu else {},
+            "last_success": self.coordinator.last_success.isoformat() if self.coordinator.last_success else None,
+            "stale_since": self.coordinator.stale_since.isoformat() if self.coordinator.stale_since else None,
+        }
+
+
+def _last_success(coordinator):
+    return coordinator.last_success
+
+def _cache_hit_percent(coordinator):
+    ratio = coordinator.stats.cache_hit_ratio()
+    return None if ratio is None else round(ratio * 100, 1)
+
+def _latency_attributes(coordinator):
+    return {
+        **{f"latency_{p}": ms for p, ms in coordinator.stats.latency().items()},
+        **{f"parse_{p}": ms for p, ms in coordinator.stats.parse_time().items()},
+    }
+
+def _cache_attributes(coordinator):
+    return {name: ratio for name, ratio in coordinator.stats.as_dict()["cache_hit_ratio"].items() if name != "all"}
+
+# key -> (name, value, unit, device class, state class, attributes)
+DIAGNOSTIC_SENSORS = {
+    "requests": (
+        "API Requests",
+        lambda coordinator: coordinator.stats.total_requests,
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda coordinator: {"by_kind": dict(coordinator.stats.requests)},
+    ),
+    "latency": (
+        "API Latency",
+        lambda coordinator: coordinator.stats.latency()["p50"],
+        UnitOfTime.MILLISECONDS,
+        SensorDeviceClass.DURATION,
+        SensorStateClass.MEASUREMENT,
+        _latency_attributes,
+    ),
+    "bytes": (
+        "API Data Received",
+        lambda coordinator: coordinator.stats.bytes,
+        UnitOfInformation.BYTES,
+        SensorDeviceClass.DATA_SIZE,
+        SensorStateClass.TOTAL_INCREASING,
+        None,
+    ),
+    "cache_hit_ratio": (
+        "Cache Hit Ratio",
+        _cache_hit_percent,
+        PERCENTAGE,
+        None,
+        SensorStateClass.MEASUREMENT,
+        _cache_attributes,
+    ),
+    "errors": (
+        "API Errors",
+        lambda coordinator: coordinator.stats.total_errors,
+        None,
+        None,
+        SensorStateClass.TOTAL_INCREASING,
+        lambda coordinator: {
+            "by_reason": dict(coordinator.stats.errors),
+            "rejected_by_governor": coordinator.stats.rejected,
+        },
+    ),
+    "last_success": (
+        "Last Successful Refresh",
+        _last_success,
+        None,
+        SensorDeviceClass.TIMESTAMP,
+        None,
+        None,
+    ),
+}
+
+class DineOnCampusDiagnosticSensor(CoordinatorEntity, SensorEntity):
+    """One API or refresh statistic for an entry; disabled until enabled in the UI.
+
+    Statistics count only the requests made by the entry's coordinator, which
+    entries watching the same location share.
+    """
+
+    _attr_entity_category = EntityCategory.DIAGNOSTIC
+    _attr_entity_registry_enabled_default = False
+
+    def __init__(self, coordinator, entry, key):
+        super().__init__(coordinator)
+        name, self._value, unit, device_class, state_class, self._attributes = DIAGNOSTIC_SENSORS[key]
+        self._attr_name = f"{entry.title} {name}"
+        self._attr_unique_id = f"{entry.entry_id}_{key}"
+        self._attr_native_unit_of_measurement = unit
+        self._attr_device_class = device_class
+        self._attr_state_class = state_class
+        slug = re.sub(r'[^a-zA-Z0-9]+', '_', self._attr_name).lower().strip("_")
+        self.entity_id = f"sensor.{slug}"
+
+    @property
+    def available(self):
+        # Statistics stay readable while the API is failing
+        return True
+
+    @property
+    def native_value(self):
+        return self._value(self.coordinator)
+
+    @property
+    def extra_state_attributes(self):
+        return self._attributes(self.coordinator) if self._attributes else None
@@ -0,0 +1,168 @@
+import asyncio
+import logging
+
+import voluptuous as vol
+from homeassistant.components.sensor import DOMAIN as SENSOR_DOMAIN
+from homeassistant.core import SupportsResponse
+from homeassistant.exceptions import HomeAssistantError, ServiceValidationError
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+
+from .api import DineOnCampusApiError
+from .const import DOMAIN
+from .search import async_get_index
+
+_LOGGER = logging.getLogger(__name__)
+
+SERVICE_GET_MENU = "get_menu"
+SERVICE_SEARCH_ITEMS = "search_items"
+SERVICE_REFRESH = "refresh"
+
+GET_MENU_SCHEMA = vol.All(
+    vol.Schema({
+        vol.Exclusive("entity_id", "target"): cv.entity_id,
+        vol.Exclusive("location_id", "target"): cv.string,
+        vol.Optional("date"): cv.date,
+        vol.Optional("period"): cv.string,
+    }),
+    cv.has_at_least_one_key("entity_id", "location_id"),
+)
+
+SEARCH_ITEMS_SCHEMA = vol.Schema({
+    vol.Required("query"): cv.string,
+    vol.Optional("location_id"): cv.string,
+    vol.Optional("date"): cv.date,
+    vol.Optional("labels", default=[]): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("exclude_allergens", default=[]): vol.All(cv.ensure_list, [cv.string]),
+})
+
+REFRESH_SCHEMA = vol.Schema({
+    vol.Optional("location_id"): cv.string,
+})
+
+
+def async_setup_services(hass):
+    """Register the integration's services."""
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_GET_MENU,
+        _async_get_menu_service(hass),
+        schema=GET_MENU_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_SEARCH_ITEMS,
+        _async_search_items_service(hass),
+        schema=SEARCH_ITEMS_SCHEMA,
+        supports_response=SupportsResponse.ONLY,
+    )
+    hass.services.async_register(
+        DOMAIN,
+        SERVICE_REFRESH,
+        _async_refresh_service(hass),
+        schema=REFRESH_SCHEMA,
+    )
+
+
+def _coordinator_for_location(hass, location_id):
+    coordinator = hass.data.get(DOMAIN, {}).get("coordinators", {}).get(location_id)
+    if coordinator is None:
+        raise ServiceValidationError(f"Location {location_id} is not configured in DineOnCampus")
+    return coordinator
+
+
+def _coordinator_for_entity(hass, entity_id):
+    entity = er.async_get(hass).async_get(entity_id)
+    coordinator = None
+    if entity is not None and entity.platform == DOMAIN:
+        coordinator = hass.data.get(DOMAIN, {}).get("entries", {}).get(entity.config_entry_id)
+    if coordinator is None:
+        raise ServiceValidationError(f"{entity_id} is not a DineOnCampus sensor")
+    return coordinator
+
+
+def _wanted_menu(hass, entity_id):
+    """``(date, period name)`` a menu sensor is showing, or None outside its windows."""
+    component = hass.data.get(SENSOR_DOMAIN)
+    entity = component.get_entity(entity_id) if component else None
+    if entity is None or not hasattr(entity, "_wanted_menu"):
+        raise ServiceValidationError(f"{entity_id} is not a DineOnCampus menu sensor")
+    return entity._wanted_menu()
+
+
+def _menu_response(period_name, menu):
+    return {**menu.as_dict(), "period": period_name, "total": menu.total}
+
+
+def _async_get_menu_service(hass):
+    async def _get_menu(call):
+        date = (call.data.get("date") or dt_util.now().date()).strftime("%Y-%m-%d")
+        period_name = call.data.get("period")
+        if "entity_id" in call.data:
+            coordinator = _coordinator_for_entity(hass, call.data["entity_id"])
+            if not period_name:
+                # After midnight in an overnight window the sensor still shows yesterday's service date
+                wanted = _wanted_menu(hass, call.data["entity_id"])
+                if wanted is None:
+                    raise ServiceValidationError(f"{call.data['entity_id']} has no active period; pass one")
+                if "date" in call.data:
+                    period_name = wanted[1]
+                else:
+                    date, period_name = wanted
+        else:
+            coordinator = _coordinator_for_location(hass, call.data["location_id"])
+
+        try:
+            if period_name:
+                names = [period_name]
+            else:
+                periods = await coordinator.api.async_get_periods(coordinator.location_id, date)
+                names = [p.get("name") for p in periods if p.get("name")]
+            menus = []
+            for name in names:
+                menu = await coordinator.async_get_menu(date, name)
+                if menu is not None:
+                    menus.append(_menu_response(name, menu))
+        except DineOnCampusApiError as e:
+            raise HomeAssistantError(f"Could not fetch the menu: {e}") from e
+
+        return {"location_id": coordinator.location_id, "date": date, "menus": menus}
+
+    return _get_menu
+
+
+def _async_search_items_service(hass):
+    async def _search_items(call):
+        date = call.data.get("date")
+        items = async_get_index(hass).search(
+            call.data["query"],
+            location_id=call.data.get("location_id"),
+            date=date.strftime("%Y-%m-%d") if date else None,
+            labels=call.data["labels"],
+            exclude_allergens=call.data["exclude_allergens"],
+        )
+        return {"matches": [item.as_dict() for item in items]}
+
+    return _search_items
+
+
+def _async_refresh_service(hass):
+    async def _refresh(call):
+        data = hass.data.get(DOMAIN, {})
+        location_id = call.data.get("location_id")
+        if location_id is None:
+            coordinators = [*data.get("coordinators", {}).values(), *data.get("sites", {}).values()]
+        else:
+            # A location is covered by its own entries and by any whole-site entry listing it
+            coordinators = [
+                site for site in data.get("sites", {}).values() if site.data and location_id in site.data
+            ]
+            if location_id in data.get("coordinators", {}):
+                coordinators.append(data["coordinators"][location_id])
+            if not coordinators:
+                raise ServiceValidationError(f"Location {location_id} is not configured in DineOnCampus")
+        await asyncio.gather(*(coordinator.async_refresh_now() for coordinator in coordinators))
+
+    return _refresh
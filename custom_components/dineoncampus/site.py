@@ -0,0 +1,163 @@
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.helpers.update_coordinator import UpdateFailed
+from homeassistant.util import dt as dt_util
+
+from .api import DineOnCampusApiError
+from .const import (
+    DEFAULT_MAX_STALE_HOURS,
+    DOMAIN,
+    SITE_MENU_CONCURRENCY,
+    SITE_REFRESH_INTERVAL,
+    SITE_REVALIDATE_BATCH,
+    SLOW_REFRESH_INTERVAL,
+    STALE_RETRY_INTERVAL,
+)
+from .coordinator import DineOnCampusBaseCoordinator
+from .models import parse_location_status
+from .schedule import WindowSchedule, default_windows
+from .search import async_get_index
+
+_LOGGER = logging.getLogger(__name__)
+
+
+class DineOnCampusSiteCoordinator(DineOnCampusBaseCoordinator):
+    """Every location at one school, for an entry in whole-site mode.
+
+    A refresh only awaits one ``status_by_site`` call; open locations' menus
+    load in a background task. ``data`` maps location id to a SiteLocation.
+    """
+
+    def __init__(self, hass, entry):
+        super().__init__(
+            hass,
+            _LOGGER,
+            config_entry=entry,
+            name=f"{DOMAIN} site {entry.data['school_id']}",
+            update_interval=SITE_REFRESH_INTERVAL,
+        )
+        self.site_id = entry.data["school_id"]
+        self._index = async_get_index(hass)
+        self._menus = {}
+        self._schedules = {}
+        self._menu_task = None
+        self._max_stale = timedelta(hours=entry.options.get("max_stale_hours", DEFAULT_MAX_STALE_HOURS))
+        self.last_success = None
+        self.stale_since = None
+
+    async def async_shutdown(self):
+        await super().async_shutdown()
+        if self._menu_task is not None:
+            self._menu_task.cancel()
+        self._index.remove_owner(self)
+
+    async def _async_schedule(self, location_id, date):
+        schedule = self._schedules.get((location_id, date))
+        if schedule is None:
+            periods = await self.api.async_get_periods(location_id, date, self.stats)
+            schedule = WindowSchedule(default_windows(periods))
+            # Empty schedules follow the periods cache and its shorter negative TTL
+            if periods:
+                self._schedules[(location_id, date)] = schedule
+        return schedule
+
+    async def _async_load_menu(self, location, now, revalidate=False):
+        schedule = await self._async_schedule(location.id, now.strftime("%Y-%m-%d"))
+        active = schedule.active(now)
+        if active is None:
+            return
+        window, service_date = active
+        date = service_date.strftime("%Y-%m-%d")
+        key = (location.id, date, window.name.lower())
+        location.period = window.name
+        cached = self._menus.get(key)
+        if cached is not None:
+            location.menu = cached[1]
+            if not revalidate:
+                self.stats.record_cache("menus", True)
+                return
+        self.stats.record_cache("menus", False)
+
+        period_id = await self.api.async_resolve_period_id(location.id, date, window.name, self.stats)
+        if period_id is None:
+            return
+        menu = await self._fetch_menu(location.id, date, period_id, window.name)
+        if self._closed:
+            return
+        self._menus[key] = (now, menu)
+        self._index.update_menu(self, location.id, location.name, date, key[2], menu)
+        location.menu = menu
+
+    def _prune(self, now):
+        oldest = (now - timedelta(days=1)).strftime("%Y-%m-%d")
+        for key in [k for k in self._menus if k[1] < oldest]:
+            del self._menus[key]
+            self._index.remove_menu(self, *key)
+        for key in [k for k in self._schedules if k[1] < oldest]:
+            del self._schedules[key]
+
+    async def _async_fetch(self, force):
+        now = dt_util.now()
+        try:
+            statuses = await self.api.async_get_locations(self.site_id, self.stats)
+        except DineOnCampusApiError as e:
+            self.stale_since = self.stale_since or now
+            self.update_interval = STALE_RETRY_INTERVAL + self._jitter
+            if self.data is None or now - (self.last_success or self.stale_since) > self._max_stale:
+                raise UpdateFailed(f"Could not fetch location status for site {self.site_id}: {e}") from e
+            _LOGGER.warning("Could not fetch location status for site %s, keeping the last result: %s", self.site_id, e)
+            return self.data
+
+        self.last_success = now
+        self.stale_since = None
+        self.update_interval = SITE_REFRESH_INTERVAL + self._jitter
+        previous = self.data or {}
+        locations = {}
+        for raw in statuses:
+            location = parse_location_status(raw)
+            if location is None:
+                continue
+            # Keep showing the menu loaded so far until the background load replaces it
+            old = previous.get(location.id)
+            if old is not None and location.is_open:
+                location.period, location.menu = old.period, old.menu
+            locations[location.id] = location
+        open_locations = [location for location in locations.values() if location.is_open]
+        _LOGGER.debug("Site %s: %s of %s locations open", self.site_id, len(open_locations), len(locations))
+
+        self._prune(now)
+        if self._menu_task is None or self._menu_task.done():
+            self._menu_task = self.hass.async_create_background_task(
+                self._async_load_menus(open_locations, now, force), f"{self.name} menus"
+            )
+        return locations
+
+    async def _async_load_menus(self, locations, now, force):
+        # Revalidate only the oldest few menus per refresh, so a large campus
+        # does not hold the shared token bucket for every poll
+        fetched = {}
+        for (location_id, _, _), (when, _) in self._menus.items():
+            fetched[location_id] = max(when, fetched.get(location_id, when))
+        oldest = sorted((when, location_id) for location_id, when in fetched.items() if now - when >= SLOW_REFRESH_INTERVAL)
+        due = {location_id for _, location_id in oldest[:SITE_REVALIDATE_BATCH]}
+
+        semaphore = asyncio.Semaphore(SITE_MENU_CONCURRENCY)
+
+        async def _load(location):
+            async with semaphore:
+                await self._async_load_menu(location, now, force or location.id in due)
+
+        results = await asyncio.gather(*(_load(location) for location in locations), return_exceptions=True)
+        for location, result in zip(locations, results):
+            if isinstance(result, DineOnCampusApiError):
+                _LOGGER.warning("Could not fetch the menu for %s: %s", location.name, result)
+            elif isinstance(result, Exception):
+                _LOGGER.error("Unexpected error loading the menu for %s", location.name, exc_info=result)
+            # A newer status refresh may have replaced data while this ran
+            current = (self.data or {}).get(location.id)
+            if current is not None and current is not location and current.is_open:
+                current.period, current.menu = location.period, location.menu
+        if not self._closed:
+            self.async_update_listeners()
@@ -0,0 +1,126 @@
+import asyncio
+from datetime import timedelta
+import logging
+
+from homeassistant.helpers.storage import Store
+from homeassistant.util import dt as dt_util
+
+from .api import async_get_api
+from .const import DOMAIN, SNAPSHOT_SAVE_DELAY
+from .models import Menu
+
+_LOGGER = logging.getLogger(__name__)
+
+STORAGE_VERSION = 2
+STORAGE_KEY = f"{DOMAIN}.snapshot"
+
+
+class _SnapshotStore(Store):
+    async def _async_migrate_func(self, old_major_version, old_minor_version, old_data):
+        # Version 1 stored menus as plain category -> item name dicts; refetch them
+        return {"periods": old_data.get("periods", {}), "categories": old_data.get("categories", {})}
+
+
+async def async_get_snapshot(hass):
+    """Return the integration's snapshot, loading it from disk on first use."""
+    data = hass.data.setdefault(DOMAIN, {})
+    snapshot = data.get("snapshot")
+    if snapshot is None:
+        snapshot = data["snapshot"] = MenuSnapshot(hass)
+    await snapshot.async_load()
+    return snapshot
+
+
+class MenuSnapshot:
+    """Last known menus and their fetch times, periods and category lists, persisted across restarts.
+
+    Loaded once before any platform is set up, so entities start from the
+    previous run's data instead of waiting on the network. Writes go through
+    ``Store.async_delay_save`` and are coalesced into one write at most every
+    ``SNAPSHOT_SAVE_DELAY`` seconds.
+    """
+
+    def __init__(self, hass):
+        self._hass = hass
+        self._store = _SnapshotStore(hass, STORAGE_VERSION, STORAGE_KEY)
+        self._lock = asyncio.Lock()
+        self._loaded = False
+        self.menus = {}
+        self.fetched = {}
+        self.categories = {}
+
+    async def async_load(self):
+        async with self._lock:
+            if self._loaded:
+                return
+            self._loaded = True
+            try:
+                stored = await self._store.async_load() or {}
+            except Exception as e:
+                _LOGGER.warning("Ignoring unreadable menu snapshot: %s", e)
+                stored = {}
+
+        today = dt_util.now().strftime("%Y-%m-%d")
+        periods_cache = async_get_api(self._hass).periods
+        for location_id, dates in stored.get("periods", {}).items():
+            for date, periods in dates.items():
+                if date >= today:
+                    periods_cache.set(location_id, date, periods)
+        for location_id, menus in stored.get("menus", {}).items():
+            self.menus[location_id] = {
+                tuple(key.split("|", 1)): Menu.from_dict(menu) for key, menu in menus.items()
+            }
+        for location_id, times in stored.get("fetched", {}).items():
+            self.fetched[location_id] = {
+                tuple(key.split("|", 1)): when
+                for key, when in ((key, dt_util.parse_datetime(value)) for key, value in times.items())
+                if when is not None
+            }
+        self.categories = {uid: list(names) for uid, names in stored.get("categories", {}).items()}
+        _LOGGER.debug("Restored menu snapshot for %s locations", len(self.menus))
+
+    def restore_menus(self, location_id):
+        """Return the restored ``(date, period)`` -> menu mapping for a location."""
+        return self.menus.get(location_id, {})
+
+    def restore_fetched(self, location_id):
+        """Return when each restored menu of a location was fetched, where known."""
+        return self.fetched.get(location_id, {})
+
+    def update_menus(self, location_id, menus, fetched):
+        self.menus[location_id] = menus
+        self.fetched[location_id] = fetched
+        self.async_schedule_save()
+
+    def update_categories(self, unique_id, names):
+        known = self.categories.setdefault(unique_id, [])
+        new = [name for name in names if name not in known]
+        if new:
+            known.extend(new)
+            self.async_schedule_save()
+
+    def async_schedule_save(self):
+        self._store.async_delay_save(self._data_to_save, SNAPSHOT_SAVE_DELAY)
+
+    def _data_to_save(self):
+        oldest = (dt_util.now() - timedelta(days=1)).strftime("%Y-%m-%d")
+        return {
+            "menus": {
+                location_id: {
+                    f"{date}|{period}": menu.as_dict()
+                    for (date, period), menu in menus.items()
+                    if date >= oldest and menu is not None
+                }
+                for location_id, menus in self.menus.items()
+            },
+            "fetched": {
+                location_id: {
+                    f"{date}|{period}": when.isoformat()
+                    for (date, period), when in fetched.items()
+                    if date >= oldest
+                }
+                for location_id, fetched in self.fetched.items()
+            },
+            "periods": async_get_api(self._hass).periods.as_dict(),
+            "categories": self.categories,
+        }
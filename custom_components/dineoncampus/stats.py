@@ -0,0 +1,105 @@
+from collections import Counter, deque
+
+from homeassistant.util import dt as dt_util
+
+from .const import STATS_SAMPLES
+
+
+def _percentiles(samples):
+    if not samples:
+        return {"p50": None, "p95": None, "p99": None}
+    ordered = sorted(samples)
+    return {
+        f"p{p}": round(ordered[min(len(ordered) - 1, len(ordered) * p // 100)] * 1000, 1)
+        for p in (50, 95, 99)
+    }
+
+
+class RequestStats:
+    """Counters for the API client and the caches in front of it.
+
+    Latency and parse times keep only the last ``STATS_SAMPLES`` samples, so
+    percentiles describe recent behaviour. Everything else counts from
+    startup. Everything recorded is also recorded on ``parent``, so a
+    coordinator's own counters roll up into the API-wide ones.
+    """
+
+    def __init__(self, parent=None):
+        self._parent = parent
+        self.requests = Counter()
+        self.errors = Counter()
+        self.rejected = 0
+        self.bytes = 0
+        self.last_success = None
+        self._cache = Counter()
+        self._latencies = deque(maxlen=STATS_SAMPLES)
+        self._parse_times = deque(maxlen=STATS_SAMPLES)
+
+    @property
+    def total_requests(self):
+        return sum(self.requests.values())
+
+    @property
+    def total_errors(self):
+        return sum(self.errors.values())
+
+    def record_request(self, kind, seconds, size):
+        """Record a request that got an HTTP response."""
+        self.requests[kind] += 1
+        self.bytes += size
+        self._latencies.append(seconds)
+        if self._parent is not None:
+            self._parent.record_request(kind, seconds, size)
+
+    def record_success(self):
+        self.last_success = dt_util.utcnow()
+        if self._parent is not None:
+            self._parent.record_success()
+
+    def record_error(self, reason):
+        self.errors[reason] += 1
+        if self._parent is not None:
+            self._parent.record_error(reason)
+
+    def record_rejected(self):
+        """Record a request refused by the governor without touching the network."""
+        self.rejected += 1
+        if self._parent is not None:
+            self._parent.record_rejected()
+
+    def record_cache(self, cache, hit):
+        self._cache[(cache, hit)] += 1
+        if self._parent is not None:
+            self._parent.record_cache(cache, hit)
+
+    def record_parse(self, seconds):
+        self._parse_times.append(seconds)
+        if self._parent is not None:
+            self._parent.record_parse(seconds)
+
+    def latency(self):
+        """Recent request latency percentiles, in milliseconds."""
+        return _percentiles(self._latencies)
+
+    def parse_time(self):
+        """Recent menu parse time percentiles, in milliseconds."""
+        return _percentiles(self._parse_times)
+
+    def cache_hit_ratio(self, cache=None):
+        """Share of cache lookups answered without a request, or None before any lookup."""
+        hits = sum(n for (name, hit), n in self._cache.items() if hit and cache in (None, name))
+        lookups = sum(n for (name, _), n in self._cache.items() if cache in (None, name))
+        return round(hits / lookups, 3) if lookups else None
+
+    def as_dict(self):
+        caches = sorted({name for name, _ in self._cache})
+        return {
+            "requests": dict(self.requests),
+            "errors": dict(self.errors),
+            "rejected_by_governor": self.rejected,
+            "bytes": self.bytes,
+            "latency_ms": self.latency(),
+            "parse_ms": self.parse_time(),
+            "cache_hit_ratio": {"all": self.cache_hit_ratio(), **{name: self.cache_hit_ratio(name) for name in caches}},
+            "last_success": self.last_success.isoformat() if self.last_success else None,
+        }
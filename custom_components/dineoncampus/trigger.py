@@ -0,0 +1,63 @@
+"""Trigger when a matching item shows up on a DineOnCampus menu.
+
+Example::
+
+    trigger:
+      - platform: dineoncampus
+        query: chicken tenders
+        labels: [Halal]
+"""
+import voluptuous as vol
+from homeassistant.const import CONF_PLATFORM
+from homeassistant.core import HassJob, callback
+import homeassistant.helpers.config_validation as cv
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from .const import DOMAIN
+from .search import SIGNAL_ITEMS_ADDED, tokenize
+
+
+def _searchable(value):
+    """Reject queries without a word to match, which would match every item."""
+    if not tokenize(value):
+        raise vol.Invalid("query must contain at least one letter or digit")
+    return value
+
+
+TRIGGER_SCHEMA = cv.TRIGGER_BASE_SCHEMA.extend({
+    vol.Required(CONF_PLATFORM): DOMAIN,
+    vol.Required("query"): vol.All(cv.string, _searchable),
+    vol.Optional("location_id"): cv.string,
+    vol.Optional("labels", default=[]): vol.All(cv.ensure_list, [cv.string]),
+    vol.Optional("exclude_allergens", default=[]): vol.All(cv.ensure_list, [cv.string]),
+})
+
+
+async def async_attach_trigger(hass, config, action, trigger_info):
+    """Fire once for each matching item added to any menu in memory."""
+    trigger_data = trigger_info["trigger_data"]
+    job = HassJob(action)
+    tokens = tokenize(config["query"])
+    location_id = config.get("location_id")
+
+    @callback
+    def _items_added(items):
+        for item in items:
+            if (
+                tokens <= tokenize(item.name)
+                and (location_id is None or item.location_id == location_id)
+                and item.matches(config["labels"], config["exclude_allergens"])
+            ):
+                hass.async_run_hass_job(
+                    job,
+                    {
+                        "trigger": {
+                            **trigger_data,
+                            "platform": DOMAIN,
+                            "description": f"{item.name} on the {item.location_name} {item.period} menu",
+                            **item.as_dict(),
+                        }
+                    },
+                )
+
+    return async_dispatcher_connect(hass, SIGNAL_ITEMS_ADDED, _items_added)
@@ -0,0 +1,93 @@
+"""Config entries and API payloads shared by the integration tests."""
+from pytest_homeassistant_custom_component.common import MockConfigEntry
+
+from custom_components.dineoncampus.const import API_BASE_URL, DOMAIN
+
+SCHOOL_ID = "school1"
+LOCATION_ID = "loc1"
+LOCATION_NAME = "Commons"
+PERIODS = [
+    {"id": "p1", "name": "Breakfast", "slug": "breakfast"},
+    {"id": "p2", "name": "Lunch", "slug": "lunch"},
+    {"id": "p3", "name": "Dinner", "slug": "dinner"},
+    {"id": "p4", "name": "Late Night", "slug": "late_night"},
+]
+
+# 2026-03-02 is a Monday; the test instance runs on US/Pacific
+TODAY = "2026-03-02"
+NOON = "2026-03-02T12:00:00-08:00"
+
+PERIODS_URL = f"{API_BASE_URL}/locations/{LOCATION_ID}/periods/"
+MENU_URL = f"{API_BASE_URL}/locations/{LOCATION_ID}/menu"
+STATUS_URL = f"{API_BASE_URL}/locations/status_by_site"
+SITES_URL = f"{API_BASE_URL}/sites/public"
+
+
+def menu_payload(*names, category="Grill"):
+    """A menu response with one category holding ``names``."""
+    return {"period": {"categories": [{"name": category, "items": [{"name": name} for name in names]}]}}
+
+
+def mock_menu(aioclient_mock, *names, category="Grill", **kwargs):
+    """Answer every menu request with ``names``, dropping earlier answers and recorded calls."""
+    aioclient_mock.clear_requests()
+    aioclient_mock.get(PERIODS_URL, json={"periods": PERIODS})
+    if kwargs:
+        aioclient_mock.get(MENU_URL, **kwargs)
+    else:
+        aioclient_mock.get(MENU_URL, json=menu_payload(*names, category=category))
+
+
+def menu_calls(aioclient_mock):
+    return sum(1 for _, url, _, _ in aioclient_mock.mock_calls if url.path.endswith("/menu"))
+
+
+def static_entry(period_name="Lunch", **options):
+    period = next(p for p in PERIODS if p["name"] == period_name)
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"School - {LOCATION_NAME} - {period_name}",
+        unique_id=f"{SCHOOL_ID}_{LOCATION_ID}_{period['id']}",
+        data={
+            "school_id": SCHOOL_ID,
+            "location_id": LOCATION_ID,
+            "location_name": LOCATION_NAME,
+            "period_id": period["id"],
+            "period_name": period_name,
+            "dynamic": False,
+        },
+        options=options,
+    )
+
+
+def dynamic_entry(windows, **options):
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title=f"School - {LOCATION_NAME} (Dynamic)",
+        unique_id=f"{SCHOOL_ID}_{LOCATION_ID}_dynamic",
+        data={
+            "school_id": SCHOOL_ID,
+            "location_id": LOCATION_ID,
+            "location_name": LOCATION_NAME,
+            "dynamic": True,
+            "period_windows": windows,
+        },
+        options=options,
+    )
+
+
+def site_entry(**options):
+    return MockConfigEntry(
+        domain=DOMAIN,
+        title="School (All Locations)",
+        unique_id=f"{SCHOOL_ID}_site",
+        data={"school_id": SCHOOL_ID, "school_name": "School", "site": True},
+        options=options,
+    )
+
+
+async def async_setup_entries(hass, *entries):
+    for entry in entries:
+        entry.add_to_hass(hass)
+        assert await hass.config_entries.async_setup(entry.entry_id)
+    await hass.async_block_till_done()
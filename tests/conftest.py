@@ -0,0 +1,29 @@
+"""Fixtures for the integration tests.
+
+Run from the repository root with::
+
+    pip install -r requirements_test.txt
+    pytest
+"""
+import pytest
+
+from .common import NOON, mock_menu
+
+
+@pytest.fixture(autouse=True)
+def auto_enable_custom_integrations(enable_custom_integrations):
+    yield
+
+
+@pytest.fixture
+def expected_lingering_timers():
+    """Entries stay loaded when a test ends, with their refreshes scheduled."""
+    return True
+
+
+@pytest.fixture
+def mock_api(aioclient_mock, freezer):
+    """Noon on a Monday, with Commons serving a two-item Grill menu for every period."""
+    freezer.move_to(NOON)
+    mock_menu(aioclient_mock, "Cheeseburger", "Fries")
+    return aioclient_mock
@@ -0,0 +1,40 @@
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.dineoncampus.cache import NEGATIVE_TTL, PeriodsCache, next_local_midnight
+
+PERIODS = [{"id": "1", "name": "Lunch"}]
+
+
+def test_next_local_midnight():
+    now = dt_util.now()
+    midnight = next_local_midnight(now)
+    assert midnight > now
+    assert midnight - now <= timedelta(days=1)
+    assert (midnight.hour, midnight.minute) == (0, 0)
+
+
+def test_periods_kept_until_midnight(freezer):
+    freezer.move_to("2026-03-02T12:00:00+00:00")
+    cache = PeriodsCache()
+    assert cache.get("loc", "2026-03-02") is None
+
+    cache.set("loc", "2026-03-02", PERIODS)
+    freezer.tick(timedelta(hours=11))
+    assert cache.get("loc", "2026-03-02") == PERIODS
+    assert cache.as_dict() == {"loc": {"2026-03-02": PERIODS}}
+
+    freezer.tick(timedelta(hours=1, seconds=1))
+    assert cache.get("loc", "2026-03-02") is None
+    assert cache.as_dict() == {}
+
+
+def test_empty_periods_expire_early(freezer):
+    freezer.move_to("2026-03-02T12:00:00+00:00")
+    cache = PeriodsCache()
+    cache.set("loc", "2026-03-02", [])
+    assert cache.get("loc", "2026-03-02") == []
+
+    freezer.tick(NEGATIVE_TTL + timedelta(seconds=1))
+    assert cache.get("loc", "2026-03-02") is None
@@ -0,0 +1,66 @@
+import asyncio
+from datetime import timedelta
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.dineoncampus.api import DineOnCampusApiError
+from custom_components.dineoncampus.catalog import STORAGE_KEY, async_get_catalog
+
+from .common import SITES_URL
+
+SITES = [{"id": "s1", "name": "North College"}, {"id": "s2", "name": "South College"}]
+
+
+def _stored_sites(sites, age):
+    return {
+        "version": 1,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {"sites": {"fetched": (dt_util.utcnow() - age).isoformat(), "items": sites}, "locations": {}},
+    }
+
+
+async def test_concurrent_lookups_share_one_fetch(hass, aioclient_mock):
+    aioclient_mock.get(SITES_URL, json={"sites": [*SITES, {"id": "s3"}]})
+    catalog = async_get_catalog(hass)
+
+    _, matches = await asyncio.gather(catalog.async_warm(), catalog.async_search_sites("college north"))
+    assert matches == {"North College": "s1"}
+    # Entries without a name are dropped
+    assert await catalog.async_get_sites() == SITES
+    assert aioclient_mock.call_count == 1
+
+
+async def test_stale_list_is_served_while_it_refreshes(hass, hass_storage, aioclient_mock):
+    hass_storage[STORAGE_KEY] = _stored_sites(SITES[:1], timedelta(days=8))
+    aioclient_mock.get(SITES_URL, json={"sites": SITES})
+    catalog = async_get_catalog(hass)
+
+    assert await catalog.async_get_sites() == SITES[:1]
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert await catalog.async_get_sites() == SITES
+    assert aioclient_mock.call_count == 1
+
+
+async def test_failed_refresh_keeps_the_stale_list(hass, hass_storage, aioclient_mock):
+    hass_storage[STORAGE_KEY] = _stored_sites(SITES, timedelta(days=8))
+    aioclient_mock.get(SITES_URL, status=503)
+    catalog = async_get_catalog(hass)
+
+    assert await catalog.async_get_sites() == SITES
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert await catalog.async_get_sites() == SITES
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert aioclient_mock.call_count == 2
+
+
+async def test_nothing_cached_waits_for_the_api(hass, aioclient_mock):
+    aioclient_mock.get(SITES_URL, status=503)
+    catalog = async_get_catalog(hass)
+
+    with pytest.raises(DineOnCampusApiError):
+        await catalog.async_get_sites()
+    # The config flow's preload ignores the failure
+    await catalog.async_warm()
@@ -0,0 +1,91 @@
+import asyncio
+from datetime import timedelta
+
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+
+from custom_components.dineoncampus.const import DOMAIN
+from custom_components.dineoncampus.search import async_get_index
+
+from .common import LOCATION_ID, TODAY, async_setup_entries, menu_calls, menu_payload, mock_menu, static_entry
+
+
+async def _settle(hass):
+    # Entities added after the first refresh wait out the request debouncer
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=15))
+    await hass.async_block_till_done()
+
+
+async def test_entries_share_one_coordinator(hass, mock_api):
+    lunch, dinner = static_entry("Lunch"), static_entry("Dinner")
+    await async_setup_entries(hass, lunch, dinner)
+    await _settle(hass)
+
+    data = hass.data[DOMAIN]
+    assert list(data["coordinators"]) == [LOCATION_ID]
+    assert data["entries"][lunch.entry_id] is data["entries"][dinner.entry_id]
+    # One periods list and one menu per period, however many entries watch it
+    assert mock_api.call_count == 3
+    assert menu_calls(mock_api) == 2
+    assert hass.states.get("sensor.commons_lunch").state == "2"
+    assert hass.states.get("sensor.commons_dinner").state == "2"
+
+
+async def test_wanted_menu_is_not_refetched_while_fresh(hass, mock_api):
+    entry = static_entry()
+    await async_setup_entries(hass, entry)
+    await _settle(hass)
+    assert menu_calls(mock_api) == 1
+
+    await hass.data[DOMAIN]["entries"][entry.entry_id].async_request_refresh()
+    await _settle(hass)
+    assert menu_calls(mock_api) == 1
+
+
+async def test_coordinator_released_with_its_last_entry(hass, mock_api):
+    lunch, dinner = static_entry("Lunch"), static_entry("Dinner")
+    await async_setup_entries(hass, lunch, dinner)
+    coordinator = hass.data[DOMAIN]["coordinators"][LOCATION_ID]
+
+    assert await hass.config_entries.async_unload(lunch.entry_id)
+    assert hass.data[DOMAIN]["coordinators"][LOCATION_ID] is coordinator
+
+    assert await hass.config_entries.async_unload(dinner.entry_id)
+    assert hass.data[DOMAIN]["coordinators"] == {}
+    assert "prefetch_unsub" not in hass.data[DOMAIN]
+
+
+async def test_concurrent_refreshes_share_one_fetch(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+    coordinator = hass.data[DOMAIN]["coordinators"][LOCATION_ID]
+    mock_api.mock_calls.clear()
+
+    await asyncio.gather(*(coordinator.async_refresh_now() for _ in range(5)))
+    assert menu_calls(mock_api) == 1
+
+
+async def test_fetch_running_at_unload_is_dropped(hass, mock_api):
+    entry = static_entry()
+    await async_setup_entries(hass, entry)
+    coordinator = hass.data[DOMAIN]["coordinators"][LOCATION_ID]
+    requested = asyncio.Event()
+    release = asyncio.Event()
+
+    async def _slow_menu(method, url, data):
+        requested.set()
+        await release.wait()
+        return AiohttpClientMockResponse(method, url, json=menu_payload("Hot Dog"))
+
+    mock_menu(mock_api, side_effect=_slow_menu)
+    refresh = hass.async_create_task(coordinator.async_refresh_now())
+    await requested.wait()
+
+    assert await hass.config_entries.async_unload(entry.entry_id)
+    release.set()
+    await asyncio.gather(refresh, return_exceptions=True)
+    await hass.async_block_till_done()
+
+    assert async_get_index(hass).search("hot dog") == []
+    snapshot = hass.data[DOMAIN]["snapshot"]
+    assert snapshot.restore_menus(LOCATION_ID)[(TODAY, "lunch")].item_names() == {"Grill": ("Cheeseburger", "Fries")}
@@ -0,0 +1,92 @@
+import asyncio
+import time
+
+from custom_components.dineoncampus.const import FAILURE_THRESHOLD
+from custom_components.dineoncampus.governor import RequestGovernor, parse_retry_after
+
+HOST = "apiv4.dineoncampus.com"
+
+
+def _trip(governor):
+    for _ in range(FAILURE_THRESHOLD):
+        governor.record_failure(HOST)
+
+
+def _expire(governor):
+    governor._breakers[HOST].open_until = time.monotonic() - 1
+
+
+def test_parse_retry_after():
+    assert parse_retry_after("120") == 120
+    assert parse_retry_after("-5") == 0
+    assert parse_retry_after("soon") is None
+    assert parse_retry_after(None) is None
+
+
+async def test_breaker_opens_after_repeated_failures():
+    governor = RequestGovernor()
+    for _ in range(FAILURE_THRESHOLD - 1):
+        governor.record_failure(HOST)
+    assert await governor.async_acquire(HOST)
+
+    governor.record_failure(HOST)
+    assert governor.retry_in(HOST) > 0
+    assert not await governor.async_acquire(HOST)
+    assert governor.opens == 1
+
+
+async def test_retry_after_opens_at_once():
+    governor = RequestGovernor()
+    governor.record_failure(HOST, 30)
+    assert 29 < governor.retry_in(HOST) <= 30
+    assert not await governor.async_acquire(HOST)
+
+
+async def test_single_probe_after_backoff():
+    governor = RequestGovernor()
+    _trip(governor)
+    _expire(governor)
+
+    assert await governor.async_acquire(HOST)
+    assert not await governor.async_acquire(HOST)
+
+    governor.record_success(HOST)
+    assert await governor.async_acquire(HOST)
+    assert await governor.async_acquire(HOST)
+
+
+async def test_failed_probe_reopens():
+    governor = RequestGovernor()
+    _trip(governor)
+    _expire(governor)
+
+    assert await governor.async_acquire(HOST)
+    governor.record_failure(HOST)
+    assert governor.retry_in(HOST) > 0
+    assert not await governor.async_acquire(HOST)
+
+
+async def test_released_probe_can_be_retaken():
+    governor = RequestGovernor()
+    _trip(governor)
+    _expire(governor)
+
+    assert await governor.async_acquire(HOST)
+    governor.release(HOST)
+    assert await governor.async_acquire(HOST)
+
+
+async def test_cancelled_wait_does_not_take_the_probe():
+    governor = RequestGovernor()
+    _trip(governor)
+    _expire(governor)
+    governor._tokens = 0
+
+    task = asyncio.ensure_future(governor.async_acquire(HOST))
+    await asyncio.sleep(0)
+    task.cancel()
+    await asyncio.gather(task, return_exceptions=True)
+
+    assert not governor._breakers[HOST].probing
+    governor._tokens = 1
+    assert await governor.async_acquire(HOST)
@@ -0,0 +1,60 @@
+from custom_components.dineoncampus.models import Menu, diff_menus, parse_location_status, parse_menu
+
+PAYLOAD = {
+    "period": {
+        "name": "Lunch",
+        "categories": [
+            {
+                "name": "Grill",
+                "items": [
+                    {"name": "Cheeseburger", "filters": [{"name": "Wheat", "type": "allergen"}]},
+                    {"name": "Veggie Burger", "filters": [{"name": "Vegan", "type": "label"}, {"type": "label"}]},
+                ],
+            },
+            {"name": None, "items": [{"name": "Fries"}]},
+        ],
+    }
+}
+
+
+def test_parse_menu():
+    menu = parse_menu(PAYLOAD, "Lunch")
+    assert menu.period == "Lunch"
+    assert menu.total == 3
+    grill = menu.categories[0]
+    assert grill.items[0].allergens == ("Wheat",)
+    assert grill.items[1].labels == ("Vegan",)
+    assert menu.item_names() == {"Grill": ("Cheeseburger", "Veggie Burger"), "Unknown": ("Fries",)}
+
+
+def test_parse_menu_without_period():
+    for payload in ({}, {"period": None}, [], None):
+        assert parse_menu(payload, "Lunch") == Menu("Lunch")
+
+
+def test_round_trip_and_digest():
+    menu = parse_menu(PAYLOAD, "Lunch")
+    restored = Menu.from_dict(menu.as_dict())
+    assert restored == menu
+    assert restored.digest() == menu.digest()
+
+    reordered = Menu(menu.period, tuple(reversed(menu.categories)))
+    assert reordered.digest() == menu.digest()
+    assert parse_menu(PAYLOAD, "Dinner").digest() != menu.digest()
+
+
+def test_diff_menus():
+    old = parse_menu(PAYLOAD, "Lunch")
+    new = Menu.from_dict({"period": "Lunch", "categories": [{"name": "Grill", "items": [{"name": "Cheeseburger"}, {"name": "Hot Dog"}]}]})
+    added, removed = diff_menus(old, new)
+    assert added == [{"category": "Grill", "name": "Hot Dog"}]
+    assert removed == [{"category": "Grill", "name": "Veggie Burger"}, {"category": "Unknown", "name": "Fries"}]
+    assert diff_menus(None, None) == ([], [])
+
+
+def test_parse_location_status():
+    location = parse_location_status({"id": 7, "name": "Commons", "status": {"label": "Open", "message": "Open until 8pm"}})
+    assert (location.id, location.name, location.is_open, location.status) == ("7", "Commons", True, "Open until 8pm")
+    assert not parse_location_status({"id": "8", "status": "closed"}).is_open
+    assert parse_location_status({"name": "No id"}) is None
+    assert parse_location_status("garbage") is None
@@ -0,0 +1,69 @@
+from datetime import date, datetime
+
+import pytest
+
+from homeassistant.util import dt as dt_util
+
+from custom_components.dineoncampus.schedule import WindowSchedule, default_windows, parse_time
+
+# 2026-03-02 is a Monday
+MONDAY = (2026, 3, 2)
+
+
+def _at(hour, minute=0, day=0):
+    year, month, first = MONDAY
+    return datetime(year, month, first + day, hour, minute, tzinfo=dt_util.DEFAULT_TIME_ZONE)
+
+
+def test_parse_time():
+    assert parse_time("07:30") == 450
+    assert parse_time(" 0:00 ") == 0
+    for value in ("24:00", "12:60", "noon", ""):
+        with pytest.raises(ValueError):
+            parse_time(value)
+
+
+def test_default_windows_use_slugs():
+    windows = default_windows([{"id": "1", "name": "Lunch", "slug": "lunch"}, {"id": "2", "name": "Late Night"}])
+    assert windows["lunch"] == {"id": "1", "name": "Lunch", "start": "11:00", "end": "15:00"}
+    assert (windows["late night"]["start"], windows["late night"]["end"]) == ("00:00", "23:59")
+
+
+def test_active_window_and_inclusive_end():
+    schedule = WindowSchedule({"lunch": {"id": "1", "name": "Lunch", "start": "11:00", "end": "14:00"}})
+    assert schedule.active(_at(10, 59)) is None
+    window, service_date = schedule.active(_at(14, 0))
+    assert window.name == "Lunch"
+    assert service_date == date(*MONDAY)
+    assert schedule.active(_at(14, 1)) is None
+
+
+def test_overnight_window_belongs_to_the_previous_day():
+    schedule = WindowSchedule({"late": {"name": "Late Night", "start": "22:00", "end": "01:59"}})
+    window, service_date = schedule.active(_at(1, 30, day=1))
+    assert window.slug == "late"
+    assert service_date == date(*MONDAY)
+    assert schedule.active(_at(2, 0, day=1)) is None
+
+
+def test_days_limit_a_window():
+    schedule = WindowSchedule({"brunch": {"name": "Brunch", "start": "10:00", "end": "13:00", "days": ["sat", "sun"]}})
+    assert schedule.active(_at(11)) is None
+    assert schedule.active(_at(11, day=5))[0].name == "Brunch"
+
+
+def test_bad_windows_are_skipped():
+    schedule = WindowSchedule({
+        "lunch": {"name": "Lunch", "start": "11:00", "end": "14:00"},
+        "broken": {"name": "Broken", "start": "late", "end": "14:00"},
+        "missing": {"name": "Missing"},
+    })
+    assert [window.slug for window in schedule.windows] == ["lunch"]
+
+
+def test_next_transition():
+    schedule = WindowSchedule({"lunch": {"name": "Lunch", "start": "11:00", "end": "14:00"}})
+    assert schedule.next_transition(_at(9)) == _at(11)
+    assert schedule.next_transition(_at(12)) == _at(14, 1)
+    assert schedule.next_transition(_at(15)) == _at(11, day=1)
+    assert WindowSchedule({}).next_transition(_at(9)) is None
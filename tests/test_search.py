@@ -0,0 +1,66 @@
+from homeassistant.helpers.dispatcher import async_dispatcher_connect
+
+from custom_components.dineoncampus.models import Menu
+from custom_components.dineoncampus.search import SIGNAL_ITEMS_ADDED, MenuIndex, tokenize
+
+DATE = "2026-03-02"
+
+
+def _menu(*names, category="Grill"):
+    return Menu.from_dict({
+        "period": "Lunch",
+        "categories": [{"name": category, "items": [{"name": name, "labels": ["Vegan"] if "Veggie" in name else []} for name in names]}],
+    })
+
+
+def test_tokenize():
+    assert tokenize("Veggie Burger (V)") == {"veggie", "burger", "v"}
+    assert tokenize(None) == set()
+
+
+async def test_search(hass):
+    index = MenuIndex(hass)
+    index.update_menu("owner", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger", "Veggie Burger"))
+    index.update_menu("owner", "loc2", "Hall", DATE, "lunch", _menu("Burger Bowl"))
+
+    assert [item.name for item in index.search("burger")] == ["Veggie Burger", "Burger Bowl"]
+    assert [item.name for item in index.search("veggie burger")] == ["Veggie Burger"]
+    assert [item.location_id for item in index.search("burger", location_id="loc2")] == ["loc2"]
+    assert [item.name for item in index.search("burger", labels=["vegan"])] == ["Veggie Burger"]
+    assert index.search("") == []
+
+
+async def test_replacing_a_menu_drops_old_items(hass):
+    index = MenuIndex(hass)
+    index.update_menu("owner", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger"))
+    index.update_menu("owner", "loc1", "Commons", DATE, "lunch", _menu("Hot Dog"))
+    assert index.search("cheeseburger") == []
+    assert len(index.search("hot dog")) == 1
+
+
+async def test_owners_are_independent(hass):
+    index = MenuIndex(hass)
+    index.update_menu("location", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger"))
+    index.update_menu("site", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger"))
+    assert len(index.search("cheeseburger")) == 1
+
+    index.remove_owner("site")
+    assert len(index.search("cheeseburger")) == 1
+
+    index.remove_menu("location", "loc1", DATE, "lunch")
+    assert index.search("cheeseburger") == []
+    assert not index._postings
+
+
+async def test_only_new_items_are_announced(hass):
+    announced = []
+    async_dispatcher_connect(hass, SIGNAL_ITEMS_ADDED, lambda items: announced.append([item.name for item in items]))
+    index = MenuIndex(hass)
+
+    index.update_menu("location", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger"))
+    index.update_menu("site", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger"))
+    index.update_menu("location", "loc1", "Commons", DATE, "lunch", _menu("Cheeseburger", "Hot Dog"))
+    index.update_menu("location", "loc2", "Hall", DATE, "lunch", _menu("Fries"), announce=False)
+    await hass.async_block_till_done()
+
+    assert announced == [["Cheeseburger"], ["Hot Dog"]]
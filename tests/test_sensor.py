@@ -0,0 +1,154 @@
+from datetime import timedelta
+
+from homeassistant.const import EVENT_STATE_CHANGED, STATE_UNAVAILABLE
+from homeassistant.helpers import entity_registry as er
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_capture_events
+
+from custom_components.dineoncampus.const import DOMAIN, EVENT_MENU_CHANGED
+from custom_components.dineoncampus.snapshot import STORAGE_KEY, STORAGE_VERSION
+
+from .common import LOCATION_ID, TODAY, async_setup_entries, menu_payload, mock_menu, static_entry
+
+
+def _coordinator(hass):
+    return hass.data[DOMAIN]["coordinators"][LOCATION_ID]
+
+
+async def test_category_sensors_follow_the_menu(hass, mock_api):
+    entry = static_entry()
+    await async_setup_entries(hass, entry)
+
+    grill = hass.states.get("sensor.commons_grill")
+    assert grill.state == "2"
+    assert list(grill.attributes["items"]) == ["Cheeseburger", "Fries"]
+
+    mock_menu(mock_api, "Caesar Salad", category="Salads")
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.commons_lunch").state == "1"
+    assert hass.states.get("sensor.commons_salads").state == "1"
+    # A category that leaves the menu keeps its entity, unavailable
+    assert hass.states.get("sensor.commons_grill").state == STATE_UNAVAILABLE
+
+    mock_menu(mock_api, "Cheeseburger", category="Grill")
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.commons_grill").state == "1"
+    assert hass.states.get("sensor.commons_salads").state == STATE_UNAVAILABLE
+    unique_ids = {e.unique_id for e in er.async_entries_for_config_entry(er.async_get(hass), entry.entry_id)}
+    assert {uid for uid in unique_ids if uid.endswith(("_grill", "_salads"))} == {
+        f"{entry.unique_id}_grill",
+        f"{entry.unique_id}_salads",
+    }
+
+
+async def test_stale_menu_is_kept_until_max_stale(hass, mock_api, freezer):
+    await async_setup_entries(hass, static_entry(max_stale_hours=2))
+    fetched = hass.states.get("sensor.commons_lunch").attributes["last_success"]
+
+    mock_menu(mock_api, status=503)
+    freezer.tick(timedelta(hours=1))
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.commons_lunch")
+    assert state.state == "2"
+    assert state.attributes["last_success"] == fetched
+    assert state.attributes["stale_since"] == dt_util.now().isoformat()
+
+    # Two hours after the last good fetch, not after the first failure
+    freezer.tick(timedelta(hours=1, minutes=1))
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    assert hass.states.get("sensor.commons_lunch").state == STATE_UNAVAILABLE
+    assert hass.states.get("sensor.commons_grill").state == STATE_UNAVAILABLE
+
+    mock_menu(mock_api, "Cheeseburger", "Fries")
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    state = hass.states.get("sensor.commons_lunch")
+    assert state.state == "2"
+    assert state.attributes["last_success"] == dt_util.now().isoformat()
+    assert state.attributes["stale_since"] is None
+
+
+async def test_last_success_follows_each_fetch(hass, mock_api, freezer):
+    await async_setup_entries(hass, static_entry())
+    first = hass.states.get("sensor.commons_lunch").attributes["last_success"]
+
+    freezer.tick(timedelta(hours=1))
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    last_success = hass.states.get("sensor.commons_lunch").attributes["last_success"]
+    assert last_success != first
+    assert last_success == dt_util.now().isoformat()
+
+
+async def test_restored_menu_ages_from_its_fetch_time(hass, hass_storage, mock_api, freezer):
+    fetched = dt_util.now() - timedelta(hours=5, minutes=30)
+    hass_storage[STORAGE_KEY] = {
+        "version": STORAGE_VERSION,
+        "minor_version": 1,
+        "key": STORAGE_KEY,
+        "data": {
+            "menus": {LOCATION_ID: {f"{TODAY}|lunch": {"period": "Lunch", **menu_payload("Tacos")["period"]}}},
+            "fetched": {LOCATION_ID: {f"{TODAY}|lunch": fetched.isoformat()}},
+        },
+    }
+    mock_menu(mock_api, status=503)
+    await async_setup_entries(hass, static_entry())
+
+    state = hass.states.get("sensor.commons_lunch")
+    assert state.state == "1"
+    assert state.attributes["last_success"] == fetched.isoformat()
+
+    # Past the default six hours since the restored menu was fetched
+    freezer.tick(timedelta(hours=1))
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+    assert hass.states.get("sensor.commons_lunch").state == STATE_UNAVAILABLE
+
+
+async def test_state_is_written_only_on_change(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+    events = async_capture_events(hass, EVENT_STATE_CHANGED)
+
+    _coordinator(hass).async_update_listeners()
+    await hass.async_block_till_done()
+    written = {event.data["entity_id"] for event in events}
+    assert not written & {"sensor.commons_lunch", "sensor.commons_grill"}
+
+    mock_menu(mock_api, "Cheeseburger", "Hot Dog")
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+    written = {event.data["entity_id"] for event in events}
+    assert {"sensor.commons_lunch", "sensor.commons_grill"} <= written
+
+
+async def test_menu_changes_fire_an_event(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+    events = async_capture_events(hass, EVENT_MENU_CHANGED)
+
+    # Refetching the same menu is not a change
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+    assert events == []
+
+    mock_menu(mock_api, "Cheeseburger", "Hot Dog")
+    await _coordinator(hass).async_refresh_now()
+    await hass.async_block_till_done()
+
+    assert [event.data for event in events] == [{
+        "location_id": LOCATION_ID,
+        "location_name": "Commons",
+        "date": TODAY,
+        "period": "Lunch",
+        "added": [{"category": "Grill", "name": "Hot Dog"}],
+        "removed": [{"category": "Grill", "name": "Fries"}],
+    }]
@@ -0,0 +1,94 @@
+import pytest
+
+from homeassistant.exceptions import ServiceValidationError
+
+from custom_components.dineoncampus.const import DOMAIN
+
+from .common import LOCATION_ID, TODAY, async_setup_entries, dynamic_entry, menu_calls, mock_menu, static_entry
+
+LATE_NIGHT = {"late_night": {"id": "p4", "name": "Late Night", "start": "22:00", "end": "01:59"}}
+
+
+async def _get_menu(hass, **data):
+    return await hass.services.async_call(DOMAIN, "get_menu", data, blocking=True, return_response=True)
+
+
+async def test_get_menu_by_location(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+
+    response = await _get_menu(hass, location_id=LOCATION_ID, period="Lunch")
+    assert response["date"] == TODAY
+    [menu] = response["menus"]
+    assert (menu["period"], menu["total"]) == ("Lunch", 2)
+    assert [item["name"] for item in menu["categories"][0]["items"]] == ["Cheeseburger", "Fries"]
+
+    # Without a period, every period served that day
+    response = await _get_menu(hass, location_id=LOCATION_ID, date="2026-03-03")
+    assert [menu["period"] for menu in response["menus"]] == ["Breakfast", "Lunch", "Dinner", "Late Night"]
+
+
+async def test_get_menu_by_entity_uses_its_current_menu(hass, mock_api):
+    await async_setup_entries(hass, static_entry("Dinner"))
+
+    response = await _get_menu(hass, entity_id="sensor.commons_dinner")
+    assert response["date"] == TODAY
+    assert [menu["period"] for menu in response["menus"]] == ["Dinner"]
+
+
+async def test_get_menu_after_midnight_keeps_the_service_date(hass, mock_api, freezer):
+    freezer.move_to("2026-03-03T01:00:00-08:00")
+    await async_setup_entries(hass, dynamic_entry(LATE_NIGHT))
+
+    response = await _get_menu(hass, entity_id="sensor.commons_current_menu")
+    assert response["date"] == TODAY
+    assert [menu["period"] for menu in response["menus"]] == ["Late Night"]
+
+    # An explicit date still wins
+    response = await _get_menu(hass, entity_id="sensor.commons_current_menu", date="2026-03-03")
+    assert response["date"] == "2026-03-03"
+
+
+async def test_get_menu_rejects_unknown_targets(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+
+    with pytest.raises(ServiceValidationError):
+        await _get_menu(hass, location_id="elsewhere")
+    with pytest.raises(ServiceValidationError):
+        await _get_menu(hass, entity_id="sensor.not_a_menu")
+
+
+async def test_search_items(hass, mock_api):
+    payload = {"period": {"categories": [{"name": "Grill", "items": [
+        {"name": "Veggie Burger", "filters": [{"name": "Vegan", "type": "label"}]},
+        {"name": "Cheeseburger", "filters": [{"name": "Milk", "type": "allergen"}]},
+    ]}]}}
+    mock_menu(mock_api, json=payload)
+    await async_setup_entries(hass, static_entry())
+
+    async def _search(**data):
+        response = await hass.services.async_call(DOMAIN, "search_items", data, blocking=True, return_response=True)
+        return [match["item"] for match in response["matches"]]
+
+    assert await _search(query="burger") == ["Cheeseburger", "Veggie Burger"]
+    assert await _search(query="burger", labels=["vegan"]) == ["Veggie Burger"]
+    assert await _search(query="burger", exclude_allergens=["milk"]) == ["Veggie Burger"]
+    assert await _search(query="burger", location_id="elsewhere") == []
+    assert await _search(query="burger", date="2026-03-03") == []
+    assert await _search(query="!!") == []
+
+
+async def test_refresh(hass, mock_api):
+    await async_setup_entries(hass, static_entry())
+
+    mock_menu(mock_api, "Hot Dog")
+    await hass.services.async_call(DOMAIN, "refresh", {"location_id": LOCATION_ID}, blocking=True)
+    await hass.async_block_till_done()
+    # Refetched although the menu was fresh; the periods list is still cached
+    assert mock_api.call_count == menu_calls(mock_api) == 1
+    assert hass.states.get("sensor.commons_lunch").state == "1"
+
+    await hass.services.async_call(DOMAIN, "refresh", {}, blocking=True)
+    assert menu_calls(mock_api) == 2
+
+    with pytest.raises(ServiceValidationError):
+        await hass.services.async_call(DOMAIN, "refresh", {"location_id": "elsewhere"}, blocking=True)
@@ -0,0 +1,89 @@
+import asyncio
+from datetime import timedelta
+
+from pytest_homeassistant_custom_component.test_util.aiohttp import AiohttpClientMockResponse
+
+from custom_components.dineoncampus.const import DOMAIN, SLOW_REFRESH_INTERVAL
+
+from .common import (
+    LOCATION_ID,
+    MENU_URL,
+    NOON,
+    PERIODS,
+    PERIODS_URL,
+    STATUS_URL,
+    async_setup_entries,
+    menu_payload,
+    site_entry,
+)
+
+STATUSES = {
+    "locations": [
+        {"id": LOCATION_ID, "name": "Commons", "status": {"label": "Open", "message": "Open until 8pm"}},
+        {"id": "loc2", "name": "Hall", "status": {"label": "Closed", "message": "Closed today"}},
+    ]
+}
+
+
+def _paths(aioclient_mock):
+    return [url.path for _, url, _, _ in aioclient_mock.mock_calls]
+
+
+async def test_site_entry_covers_every_location(hass, mock_api):
+    mock_api.get(STATUS_URL, json=STATUSES)
+    entry = site_entry()
+    await async_setup_entries(hass, entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+
+    commons = hass.states.get("sensor.commons_menu")
+    assert commons.state == "2"
+    assert commons.attributes["period"] == "Lunch"
+    assert hass.states.get("binary_sensor.commons_open").state == "on"
+    assert hass.states.get("sensor.hall_menu").state == "0"
+    hall_open = hass.states.get("binary_sensor.hall_open")
+    assert (hall_open.state, hall_open.attributes["status"]) == ("off", "Closed today")
+    # Closed locations' menus are never requested
+    assert _paths(mock_api) == ["/locations/status_by_site", f"/locations/{LOCATION_ID}/periods/", f"/locations/{LOCATION_ID}/menu"]
+
+    # Menus are revalidated only once they are SLOW_REFRESH_INTERVAL old
+    coordinator = hass.data[DOMAIN]["sites"][entry.entry_id]
+    mock_api.mock_calls.clear()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert _paths(mock_api) == ["/locations/status_by_site"]
+
+
+async def test_menus_revalidate_after_the_slow_interval(hass, mock_api, freezer):
+    mock_api.get(STATUS_URL, json=STATUSES)
+    entry = site_entry()
+    await async_setup_entries(hass, entry)
+    await hass.async_block_till_done(wait_background_tasks=True)
+    coordinator = hass.data[DOMAIN]["sites"][entry.entry_id]
+
+    freezer.tick(SLOW_REFRESH_INTERVAL + timedelta(minutes=1))
+    mock_api.mock_calls.clear()
+    await coordinator.async_refresh()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert _paths(mock_api) == ["/locations/status_by_site", f"/locations/{LOCATION_ID}/menu"]
+
+
+async def test_setup_does_not_wait_for_menus(hass, aioclient_mock, freezer):
+    freezer.move_to(NOON)
+    release = asyncio.Event()
+
+    async def _slow_menu(method, url, data):
+        await release.wait()
+        return AiohttpClientMockResponse(method, url, json=menu_payload("Cheeseburger", "Fries"))
+
+    aioclient_mock.get(STATUS_URL, json=STATUSES)
+    aioclient_mock.get(PERIODS_URL, json={"periods": PERIODS})
+    aioclient_mock.get(MENU_URL, side_effect=_slow_menu)
+    await async_setup_entries(hass, site_entry())
+
+    # Open, but its menu is still loading
+    assert hass.states.get("binary_sensor.commons_open").state == "on"
+    assert hass.states.get("sensor.commons_menu").state == "0"
+
+    release.set()
+    await hass.async_block_till_done(wait_background_tasks=True)
+    assert hass.states.get("sensor.commons_menu").state == "2"
@@ -0,0 +1,67 @@
+from datetime import timedelta
+
+from homeassistant.const import STATE_UNAVAILABLE, STATE_UNKNOWN
+from homeassistant.util import dt as dt_util
+from pytest_homeassistant_custom_component.common import async_fire_time_changed
+
+from custom_components.dineoncampus.const import SNAPSHOT_SAVE_DELAY
+from custom_components.dineoncampus.search import async_get_index
+from custom_components.dineoncampus.snapshot import STORAGE_KEY, STORAGE_VERSION
+
+from .common import LOCATION_ID, PERIODS, SCHOOL_ID, TODAY, async_setup_entries, mock_menu, static_entry
+
+UNIQUE_ID = f"{SCHOOL_ID}_{LOCATION_ID}_p2"
+RESTORED_MENU = {
+    "period": "Lunch",
+    "categories": [{"name": "Grill", "items": [{"name": "Tacos"}, {"name": "Nachos"}, {"name": "Churros"}]}],
+}
+
+
+def _stored(data, version=STORAGE_VERSION):
+    return {"version": version, "minor_version": 1, "key": STORAGE_KEY, "data": data}
+
+
+async def test_entities_start_from_the_snapshot(hass, hass_storage, mock_api):
+    hass_storage[STORAGE_KEY] = _stored({
+        "menus": {LOCATION_ID: {f"{TODAY}|lunch": RESTORED_MENU}},
+        "categories": {UNIQUE_ID: ["Grill", "Salads"]},
+    })
+    mock_menu(mock_api, status=503)
+    await async_setup_entries(hass, static_entry())
+
+    state = hass.states.get("sensor.commons_lunch")
+    assert state.state == "3"
+    assert state.attributes["stale_since"] is not None
+    assert hass.states.get("sensor.commons_grill").state == "3"
+    # Known from an earlier menu, but not on this one
+    assert hass.states.get("sensor.commons_salads").state == STATE_UNAVAILABLE
+    assert [item.name for item in async_get_index(hass).search("tacos")] == ["Tacos"]
+
+
+async def test_fetched_menus_are_saved(hass, hass_storage, mock_api):
+    await async_setup_entries(hass, static_entry())
+    async_fire_time_changed(hass, dt_util.utcnow() + timedelta(seconds=SNAPSHOT_SAVE_DELAY + 1))
+    await hass.async_block_till_done()
+
+    data = hass_storage[STORAGE_KEY]["data"]
+    menu = data["menus"][LOCATION_ID][f"{TODAY}|lunch"]
+    assert [item["name"] for item in menu["categories"][0]["items"]] == ["Cheeseburger", "Fries"]
+    assert dt_util.parse_datetime(data["fetched"][LOCATION_ID][f"{TODAY}|lunch"]) == dt_util.now()
+    assert data["periods"][LOCATION_ID][TODAY] == PERIODS
+    assert data["categories"] == {UNIQUE_ID: ["Grill"]}
+
+
+async def test_version_1_snapshot_keeps_categories_only(hass, hass_storage, mock_api):
+    hass_storage[STORAGE_KEY] = _stored(
+        {
+            "menus": {LOCATION_ID: {f"{TODAY}|lunch": {"Grill": ["Tacos"]}}},
+            "categories": {UNIQUE_ID: ["Grill", "Salads"]},
+        },
+        version=1,
+    )
+    mock_menu(mock_api, status=503)
+    await async_setup_entries(hass, static_entry())
+
+    assert hass.states.get("sensor.commons_lunch").state == STATE_UNKNOWN
+    assert hass.states.get("sensor.commons_salads") is not None
+    assert async_get_index(hass).search("tacos") == []
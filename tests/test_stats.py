@@ -0,0 +1,27 @@
+from custom_components.dineoncampus.stats import RequestStats
+
+
+def test_records_roll_up_into_parent():
+    api = RequestStats()
+    first = RequestStats(api)
+    second = RequestStats(api)
+
+    first.record_request("menu", 0.2, 100)
+    first.record_cache("menus", True)
+    second.record_request("periods", 0.1, 50)
+    second.record_error("http_503")
+    second.record_rejected()
+    second.record_cache("menus", False)
+
+    assert (first.total_requests, first.bytes, first.total_errors) == (1, 100, 0)
+    assert (second.total_requests, second.bytes, second.rejected) == (1, 50, 1)
+    assert (api.total_requests, api.bytes, api.total_errors, api.rejected) == (2, 150, 1, 1)
+    assert first.cache_hit_ratio() == 1
+    assert api.cache_hit_ratio("menus") == 0.5
+
+
+def test_empty_stats():
+    stats = RequestStats()
+    assert stats.cache_hit_ratio() is None
+    assert stats.latency() == {"p50": None, "p95": None, "p99": None}
+    assert stats.as_dict()["last_success"] is None
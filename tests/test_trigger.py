@@ -0,0 +1,43 @@
+import pytest
+import voluptuous as vol
+
+from homeassistant.setup import async_setup_component
+from pytest_homeassistant_custom_component.common import async_mock_service
+
+from custom_components.dineoncampus.const import DOMAIN
+from custom_components.dineoncampus.trigger import TRIGGER_SCHEMA
+
+from .common import LOCATION_ID, async_setup_entries, mock_menu, static_entry
+
+
+async def test_trigger_fires_once_per_new_item(hass, mock_api):
+    calls = async_mock_service(hass, "test", "automation")
+    await async_setup_entries(hass, static_entry())
+    assert await async_setup_component(hass, "automation", {
+        "automation": {
+            "trigger": {"platform": DOMAIN, "query": "hot dog"},
+            "action": {
+                "service": "test.automation",
+                "data_template": {"item": "{{ trigger.item }}", "location": "{{ trigger.location_name }}"},
+            },
+        }
+    })
+    coordinator = hass.data[DOMAIN]["coordinators"][LOCATION_ID]
+
+    mock_menu(mock_api, "Cheeseburger", "Hot Dog")
+    await coordinator.async_refresh_now()
+    await hass.async_block_till_done()
+    assert [call.data for call in calls] == [{"item": "Hot Dog", "location": "Commons"}]
+
+    # Still on the menu, so not announced again
+    mock_menu(mock_api, "Hot Dog")
+    await coordinator.async_refresh_now()
+    await hass.async_block_till_done()
+    assert len(calls) == 1
+
+
+def test_trigger_requires_a_word_to_match():
+    assert TRIGGER_SCHEMA({"platform": DOMAIN, "query": "Hot dog!"})["query"] == "Hot dog!"
+    for query in ("", "!!", " - "):
+        with pytest.raises(vol.Invalid):
+            TRIGGER_SCHEMA({"platform": DOMAIN, "query": query})